@@ -5,13 +5,21 @@ Converts various unstructured data formats (HTML, Wiki, Markdown, URLs)
 into clean structured text files.
 """
 
+import io
+import os
 import re
+import uuid
 import html
+from functools import lru_cache
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import urlparse
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from lxml import etree
+from lxml import html as lxml_html
 
 # Try to import markdown, fallback to basic processing if not available
 try:
@@ -21,6 +29,430 @@ except ImportError:
     MARKDOWN_AVAILABLE = False
     md_lib = None
 
+# Try to import markdown-it, which yields a token stream (no HTML + DOM round trip)
+try:
+    from markdown_it import MarkdownIt
+    MARKDOWN_IT_AVAILABLE = True
+except ImportError:
+    MARKDOWN_IT_AVAILABLE = False
+    MarkdownIt = None
+
+# Try to import selectolax (lexbor backend) for fast last-resort tag stripping
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+    LexborHTMLParser = None
+
+
+# -------------------- PRECOMPILED PATTERNS --------------------
+# Compiled once at import time; these run inside per-node loops on large pages.
+
+# LinkedIn UI patterns to filter out, combined into one anchored alternation so
+# each candidate string is matched in a single pass. Branches ending in $ must match
+# the whole text; the others are prefix matches.
+_UI_NOISE_RE = re.compile(r'^(?:' + '|'.join((
+    r'\d+\s+notifications?\s+total$',
+    r'suggested\s+for\s+you$',
+    r'stand\s+out\s+and\s+build',
+    r'analytics$',
+    r'activity$',
+    r'experience$',
+    r'education$',
+    r'skills$',
+    r'interests$',
+    r'who\s+your\s+viewers\s+also\s+viewed$',
+    r'unlock\s+the\s+full\s+list$',
+    r'people\s+you\s+may\s+know$',
+    r'you\s+might\s+like$',
+    r'show\s+recruiters',
+    r'get\s+started$',
+    r'share\s+that\s+you\'re\s+hiring',
+    r'showcase\s+your\s+services',
+    r'private\s+to\s+you$',
+    r'enhance\s+your\s+profile',
+    r'\d+\s+followers?$',
+    r'show\s+your\s+qualifications',
+    r'1-month\s+free\s+trial',
+    r'we\'ll\s+remind\s+you',
+    r'home$',
+    r'my\s+network$',
+    r'jobs$',
+    r'messaging$',
+    r'notifications$',
+    r'me$',
+    r'search$',
+    r'more$',
+    r'less$',
+    r'show\s+more$',
+    r'show\s+less$',
+    r'see\s+more$',
+    r'see\s+less$',
+)) + r')')
+
+# Words that make up short (1-3 word) UI labels
+_UI_WORDS = frozenset([
+    'notifications', 'analytics', 'activity', 'experience', 'education',
+    'skills', 'interests', 'followers', 'connections', 'views', 'likes',
+    'comments', 'shares', 'more', 'less', 'show', 'hide', 'close',
+])
+
+# Class-name fragments marking navigation divs ('navbar' is covered by 'nav'); matched as
+# substrings of the class attribute, so 'global-nav__item' counts too. ASCII-only
+# case-insensitive matching equals lowercasing first, without the copy.
+_NAV_CLASS_RE = re.compile('nav|menu|sidebar|header|footer', re.I | re.A)
+
+# Script types that carry embedded JSON payloads (LinkedIn, JSON-LD)
+_JSON_SCRIPT_TYPE_RE = re.compile(r'application/json|application/ld\+json', re.I)
+
+# Single-word navigation / button labels
+_NAV_BUTTON_RE = re.compile(
+    r'^(Home|About|Contact|Login|Sign|Menu|Search|Follow|Share|Like|Comment|Subscribe|Cookie|Accept|Decline|Close|×|←|→|↑|↓|More|Less|Show|Hide)$',
+    re.I
+)
+
+# Script/style/noscript blocks, cut out of the raw HTML before parsing (LinkedIn dumps
+# are mostly embedded JSON in <script> tags). Each block is replaced with an empty
+# comment so the text around it stays in separate text nodes, as after decompose().
+# The body is matched as "[^<]* then any '<' that does not start the closing tag",
+# which is equivalent to a lazy .*? but avoids trying the closing tag at every character.
+_RAW_BLOCK_RE = re.compile(
+    r'<(script|style|noscript)(?=[\s/>])[^>]*>[^<]*(?:<(?!/\1\s*>)[^<]*)*</\1\s*>',
+    re.I
+)
+_RAW_BLOCK_PLACEHOLDER = '<!---->'
+
+# Only <body> is turned into BeautifulSoup objects; <head> content is never extracted
+_BODY_STRAINER = SoupStrainer('body')
+
+# Subtrees left out of the plain-text fallbacks in process_html_file / process_and_save
+_FILE_FALLBACK_DROP_TAGS = ("script", "style", "meta", "link")
+_SAVE_FALLBACK_DROP_TAGS = ("script", "style", "meta", "link", "nav", "header", "footer")
+
+# Text nodes kept by the process_and_save fallbacks: Fallback 1 (no scripts, styles or page
+# chrome) and Fallback 2 (everything but script/style/noscript). XPath lets both read the
+# same parsed tree without modifying it.
+_SAVE_FALLBACK_TEXT_XPATH = etree.XPath(
+    '//text()[not(ancestor::script or ancestor::style or ancestor::meta or ancestor::link'
+    ' or ancestor::nav or ancestor::header or ancestor::footer)]'
+)
+_ALL_TEXT_XPATH = etree.XPath('//text()[not(ancestor::script or ancestor::style or ancestor::noscript)]')
+
+# Chunk size for feeding large HTML documents to lxml's incremental parser
+_STREAM_CHUNK_SIZE = 1 << 16
+
+# Tags whose content is never text (skipped by the final tag-stripping fallback)
+_RAW_TEXT_TAGS = frozenset(['script', 'style', 'noscript'])
+
+# Elements dropped (with their whole subtree) before extracting text
+_UNWANTED_TAGS = ("script", "style", "noscript", "iframe", "svg", "canvas")
+
+# Tag groups used while walking the DOM in process_html
+_HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+_LIST_TAGS = frozenset(['ul', 'ol'])
+_BLOCK_TAGS = _HEADING_TAGS | {'p', 'ul', 'ol', 'table'}
+_SPAN_EXCLUDED_PARENTS = frozenset(['nav', 'button', 'a'])
+
+# Main content containers when scraping URLs
+_CONTENT_CLASS_RE = re.compile('content|main|article', re.I)
+
+# Whitespace / markup normalization
+_TAB_RUN_RE = re.compile(r'[ \t]+')
+_NL3_RE = re.compile(r'\n{3,}')
+_SP2_RE = re.compile(r' {2,}')
+_STRIP_TAGS_RE = re.compile(r'<[^>]+>')
+_PUNCT_ONLY_RE = re.compile(r'^[^\w\s]+$')
+_WORD_RUN_RE = re.compile(r'\w+')
+
+# Markdown heading line ("# Title" ... "###### Title") in _clean_and_format_text
+_HEADING_LINE_RE = re.compile(r'#{1,6}\s')
+
+# Basic Markdown -> HTML conversion when the markdown library is unavailable
+_MD_FALLBACK_RULES = [
+    (re.compile(r'^# (.+)$', re.MULTILINE), r'<h1>\1</h1>'),
+    (re.compile(r'^## (.+)$', re.MULTILINE), r'<h2>\1</h2>'),
+    (re.compile(r'^### (.+)$', re.MULTILINE), r'<h3>\1</h3>'),
+    (re.compile(r'^\* (.+)$', re.MULTILINE), r'<li>\1</li>'),
+    (re.compile(r'^- (.+)$', re.MULTILINE), r'<li>\1</li>'),
+]
+
+# Shared CommonMark parser for process_markdown
+_MARKDOWN_IT = MarkdownIt('commonmark') if MARKDOWN_IT_AVAILABLE else None
+
+# Output filename sanitization
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w\s-]')
+_FILENAME_SEPARATORS_RE = re.compile(r'[-\s]+')
+
+
+class _VisibleTextTarget:
+    """
+    lxml parser target: collects the text outside the drop_tags subtrees as the
+    parser streams through the document, without building a tree.
+    
+    Text is split at the same places as lxml text nodes (any tag, comment or
+    processing instruction), so the result matches _lxml_text() on the parsed tree.
+    """
+    
+    def __init__(self, drop_tags):
+        self.drop_tags = frozenset(drop_tags)
+        self.dropped_depth = 0  # open elements inside a dropped subtree
+        self.parts = []
+        self.pending = []  # data of the current text node
+    
+    def _flush(self):
+        if self.pending:
+            text = ''.join(self.pending).strip()
+            self.pending = []
+            if text:
+                self.parts.append(text)
+    
+    def start(self, tag, attrib):
+        self._flush()
+        if self.dropped_depth or tag in self.drop_tags:
+            self.dropped_depth += 1
+    
+    def end(self, tag):
+        self._flush()
+        if self.dropped_depth:
+            self.dropped_depth -= 1
+    
+    def data(self, data):
+        if not self.dropped_depth:
+            self.pending.append(data)
+    
+    def comment(self, text):
+        self._flush()
+    
+    def pi(self, target, data=None):
+        self._flush()
+    
+    def close(self):
+        self._flush()
+        return ' '.join(self.parts)
+
+
+def _visible_text(html_content: str, drop_tags) -> str:
+    """
+    Document text without the drop_tags subtrees, like BeautifulSoup's
+    get_text(separator=' ', strip=True) after decompose()-ing them.
+    
+    The content is fed to lxml in chunks and the text is collected from the parse
+    events, so no DOM is held in memory however large the document is.
+    """
+    try:
+        parser = etree.HTMLParser(target=_VisibleTextTarget(drop_tags))
+        for start in range(0, len(html_content), _STREAM_CHUNK_SIZE):
+            parser.feed(html_content[start:start + _STREAM_CHUNK_SIZE])
+        return parser.close()
+    except Exception:
+        # e.g. empty documents
+        soup = BeautifulSoup(html_content, 'lxml')
+        for tag in soup(list(drop_tags)):
+            tag.decompose()
+        return soup.get_text(separator=' ', strip=True)
+
+
+class _TextCollector(HTMLParser):
+    """Streaming tag stripper for the last-resort fallback: keeps text, skips script/style."""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in _RAW_TEXT_TAGS:
+            self._skip_depth += 1
+    
+    def handle_endtag(self, tag):
+        if tag in _RAW_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+    
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def _strip_tags(html_content: str) -> str:
+    """Text content of (possibly malformed) HTML, with entities decoded."""
+    if SELECTOLAX_AVAILABLE:
+        try:
+            tree = LexborHTMLParser(html_content)
+            tree.strip_tags(list(_RAW_TEXT_TAGS))
+            return tree.root.text(separator='', strip=False) if tree.root is not None else ''
+        except Exception:
+            pass
+    
+    try:
+        collector = _TextCollector()
+        collector.feed(html_content)
+        collector.close()
+        return ''.join(collector.parts)
+    except Exception:
+        return html.unescape(_STRIP_TAGS_RE.sub('', html_content))
+
+
+# Per-process processor used by process_html_files workers (created on first use)
+_worker_processor = None
+
+
+def _get_worker_processor() -> "UnstructuredDataProcessor":
+    """The processor of the current worker process, built on first use."""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = UnstructuredDataProcessor()
+    return _worker_processor
+
+
+def _process_html_file_worker(html_file_path: Path, output_dir: Optional[Path]) -> Dict[str, Any]:
+    """ProcessPoolExecutor entry point: process one HTML file in a worker process."""
+    return _get_worker_processor().process_html_file(html_file_path, output_dir)
+
+
+def _text_for_save_worker(item: Tuple[str, str, str], processor: Optional["UnstructuredDataProcessor"] = None):
+    """
+    ProcessPoolExecutor entry point: process one process_and_save_many() item
+    (with the given processor when run in the calling process).
+    
+    Returns ((processed text, safe filename), None) or (None, error message), so one
+    bad input does not abort the whole batch.
+    """
+    try:
+        return (processor or _get_worker_processor())._text_for_save(*item), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _inline_text_nodes(children) -> List[str]:
+    """
+    Stripped, non-empty text of a markdown-it inline token's children, split where the
+    rendered HTML would have separate text nodes (at every tag, e.g. around *emphasis*).
+    """
+    nodes = []
+    buffer = ''
+    for child in children or ():
+        if child.type == 'text':
+            buffer += child.content
+        elif child.type == 'softbreak':
+            buffer += '\n'
+        else:
+            if buffer.strip():
+                nodes.append(buffer.strip())
+            buffer = ''
+            if child.type == 'code_inline' and child.content.strip():
+                nodes.append(child.content.strip())
+    if buffer.strip():
+        nodes.append(buffer.strip())
+    return nodes
+
+
+def _count_exceeds(text: str, char: str, limit: int) -> bool:
+    """
+    text.count(char) > limit, but stops scanning at the (limit + 1)-th occurrence.
+    
+    The JSON heuristics use tiny limits, so on large JSON blobs this reads only the
+    first few hundred bytes instead of counting through the whole string.
+    """
+    pos = -1
+    for _ in range(limit + 1):
+        pos = text.find(char, pos + 1)
+        if pos < 0:
+            return False
+    return True
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """os.write() until all of data is written."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_atomic(output_path: Path, data: bytes) -> None:
+    """
+    Write data to output_path so readers only ever see the old file or the
+    complete new one.
+    
+    On Linux a new file is written to an anonymous O_TMPFILE and linked into
+    place; otherwise (or when replacing an existing file) a temporary file in
+    the same directory is renamed over the target.
+    """
+    if hasattr(os, 'O_TMPFILE') and not output_path.exists():
+        try:
+            fd = os.open(output_path.parent, os.O_TMPFILE | os.O_WRONLY | os.O_CLOEXEC, 0o666)
+        except OSError:
+            fd = None  # filesystem without O_TMPFILE support
+        if fd is not None:
+            try:
+                _write_all(fd, data)
+                os.link(f'/proc/self/fd/{fd}', output_path)
+                return
+            except OSError:
+                pass  # created in the meantime or /proc unavailable: use the rename path
+            finally:
+                os.close(fd)
+    
+    tmp_path = output_path.with_name(f'.{output_path.name}.{uuid.uuid4().hex}.tmp')
+    fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@lru_cache(maxsize=2048)
+def _safe_filename(filename: str, content_type: str) -> str:
+    """Output .txt filename for process_and_save (cached, as batch re-runs repeat names)."""
+    # Ensure filename is safe
+    safe_filename = _UNSAFE_FILENAME_CHARS_RE.sub('', filename).strip()
+    safe_filename = _FILENAME_SEPARATORS_RE.sub('_', safe_filename)
+    if not safe_filename:
+        safe_filename = f"processed_{content_type}"
+    
+    # Add .txt extension if not present
+    if not safe_filename.endswith('.txt'):
+        safe_filename += '.txt'
+    return safe_filename
+
+
+def _count_paragraphs(text: str) -> int:
+    """
+    Number of non-blank blocks separated by blank lines ('\n\n').
+    
+    Any text with visible content has at least one such block, so no further
+    line/sentence based estimate is needed.
+    """
+    return sum(1 for block in text.split('\n\n') if block and not block.isspace())
+
+
+def _norm_key(text_lower: str) -> int:
+    """Duplicate-detection key: hash of the (already lowercased) text with whitespace collapsed."""
+    return hash(' '.join(text_lower.split()))
+
+
+def _lxml_text(element, separator: str = ' ') -> str:
+    """lxml equivalent of BeautifulSoup's get_text(separator=separator, strip=True)."""
+    return separator.join(s for s in (t.strip() for t in element.itertext()) if s)
+
+
+def _lxml_drop(element) -> None:
+    """
+    Remove an lxml element and its subtree, like BeautifulSoup's decompose().
+    
+    An empty comment is left in its place so the text before and after stays in
+    separate text nodes (itertext() skips comments), instead of being merged
+    the way drop_tree()/strip_elements() would.
+    """
+    placeholder = etree.Comment()
+    placeholder.tail = element.tail
+    element.getparent().replace(element, placeholder)
+
 
 class UnstructuredDataProcessor:
     """Process unstructured data into structured text format."""
@@ -41,34 +473,37 @@ class UnstructuredDataProcessor:
         Returns:
             True if text looks like JSON
         """
-        if not text or len(text.strip()) < 10:
+        if not text:
             return False
         
         text = text.strip()
+        if len(text) < 10:
+            return False
         
         # Check for JSON-like patterns
         # Starts with { or [ and contains common JSON patterns
-        if (text.startswith('{') or text.startswith('[')) and (
+        if text[0] in '{[' and (
             '"entityUrn"' in text or 
             '"$type"' in text or 
             '"lixTracking"' in text or
             '"data"' in text and '"elements"' in text or
-            (text.count('"') > 5 and text.count(':') > 3)  # Multiple key-value pairs
+            (_count_exceeds(text, '"', 5) and _count_exceeds(text, ':', 3))  # Multiple key-value pairs
         ):
             return True
         
         # Check for JSON-like structure with braces and quotes
-        if text.count('{') > 2 and text.count('"') > 5:
+        if _count_exceeds(text, '{', 2) and _count_exceeds(text, '"', 5):
             return True
         
         return False
     
-    def _is_linkedin_ui_noise(self, text: str) -> bool:
+    def _is_linkedin_ui_noise(self, text: str, text_lower: Optional[str] = None) -> bool:
         """
         Check if text is LinkedIn UI noise (navigation, notifications, etc.) to filter out.
         
         Args:
             text: Text to check
+            text_lower: text.lower(), if the caller already computed it
             
         Returns:
             True if text is LinkedIn UI noise
@@ -76,63 +511,402 @@ class UnstructuredDataProcessor:
         if not text or len(text.strip()) < 3:
             return False
         
-        text_lower = text.lower().strip()
-        
-        # LinkedIn UI patterns to filter out
-        ui_patterns = [
-            r'^\d+\s+notifications?\s+total$',
-            r'^suggested\s+for\s+you$',
-            r'^stand\s+out\s+and\s+build',
-            r'^analytics$',
-            r'^activity$',
-            r'^experience$',
-            r'^education$',
-            r'^skills$',
-            r'^interests$',
-            r'^who\s+your\s+viewers\s+also\s+viewed$',
-            r'^unlock\s+the\s+full\s+list$',
-            r'^people\s+you\s+may\s+know$',
-            r'^you\s+might\s+like$',
-            r'^show\s+recruiters',
-            r'^get\s+started$',
-            r'^share\s+that\s+you\'re\s+hiring',
-            r'^showcase\s+your\s+services',
-            r'^private\s+to\s+you$',
-            r'^enhance\s+your\s+profile',
-            r'^\d+\s+followers?$',
-            r'^show\s+your\s+qualifications',
-            r'^1-month\s+free\s+trial',
-            r'^we\'ll\s+remind\s+you',
-            r'^home$',
-            r'^my\s+network$',
-            r'^jobs$',
-            r'^messaging$',
-            r'^notifications$',
-            r'^me$',
-            r'^search$',
-            r'^more$',
-            r'^less$',
-            r'^show\s+more$',
-            r'^show\s+less$',
-            r'^see\s+more$',
-            r'^see\s+less$',
-        ]
-        
-        for pattern in ui_patterns:
-            if re.match(pattern, text_lower):
-                return True
+        if text_lower is None:
+            text_lower = text.lower()
+        text_lower = text_lower.strip()
+        
+        if _UI_NOISE_RE.match(text_lower):
+            return True
         
         # Check for very short UI-like text (1-3 words that are common UI elements)
         words = text_lower.split()
-        if len(words) <= 3:
-            ui_words = ['notifications', 'analytics', 'activity', 'experience', 'education', 
-                       'skills', 'interests', 'followers', 'connections', 'views', 'likes',
-                       'comments', 'shares', 'more', 'less', 'show', 'hide', 'close']
-            if all(word in ui_words for word in words):
-                return True
+        if len(words) <= 3 and _UI_WORDS.issuperset(words):
+            return True
         
         return False
     
+    def _collect_nodes(self, root) -> Dict[str, Any]:
+        """
+        Walk the DOM under root once and bucket the elements process_html extracts from.
+        
+        Buckets keep document order, matching what separate find_all() sweeps would return.
+        Works on both BeautifulSoup tags and lxml elements.
+        
+        Args:
+            root: BeautifulSoup tag (or soup) or lxml element to walk
+            
+        Returns:
+            Dictionary with element lists ('headings' as (element, level) pairs,
+            'paragraphs', 'lists', 'tables', 'divs', 'spans'), per-container children
+            ('list_items', 'table_rows', 'row_cells', keyed by id() of the ul/ol, table
+            or tr), 'block_divs' (ids of divs containing a block element) and
+            'region_divs' (the divs inside the page's main region, or None if the page
+            has neither a <main> nor a role="main" element)
+        """
+        is_soup = isinstance(root, Tag)
+        
+        def element_children(el):
+            if is_soup:
+                return [c for c in el.children if isinstance(c, Tag)]
+            # lxml: skip comments / processing instructions (non-string tags)
+            return [c for c in el if isinstance(c.tag, str)]
+        
+        headings, paragraphs, lists, tables, divs, spans = [], [], [], [], [], []
+        list_items = {}
+        table_rows = {}
+        row_cells = {}
+        block_divs = set()
+        # Divs inside the first <main> and inside the first role="main" element
+        main_divs, role_main_divs = [], []
+        first_main = first_role_main = None
+        
+        # Enclosing divs/lists/tables/rows are tracked as linked (element, parent_chain)
+        # pairs so entering a container is O(1). Stack entries also carry whether the
+        # node sits inside a nav/button/a element (spans there are skipped) and inside
+        # the first <main> / role="main" element.
+        stack = [(child, None, None, None, None, False, False, False) for child in reversed(element_children(root))]
+        while stack:
+            el, div_chain, list_chain, table_chain, row_chain, excluded, in_main, in_role_main = stack.pop()
+            name = el.name if is_soup else el.tag
+            
+            if name == 'main' and first_main is None:
+                first_main = el
+                in_main = True
+            if first_role_main is None and el.get('role') == 'main':
+                first_role_main = el
+                in_role_main = True
+            
+            if name in _HEADING_TAGS:
+                headings.append((el, int(name[1])))
+            elif name == 'p':
+                paragraphs.append(el)
+            elif name in _LIST_TAGS:
+                lists.append(el)
+                list_items[id(el)] = []
+                list_chain = (el, list_chain)
+            elif name == 'li':
+                chain = list_chain
+                while chain is not None:
+                    list_items[id(chain[0])].append(el)
+                    chain = chain[1]
+            elif name == 'table':
+                tables.append(el)
+                table_rows[id(el)] = []
+                table_chain = (el, table_chain)
+            elif name == 'tr':
+                chain = table_chain
+                while chain is not None:
+                    table_rows[id(chain[0])].append(el)
+                    chain = chain[1]
+                row_cells[id(el)] = []
+                row_chain = (el, row_chain)
+            elif name == 'td' or name == 'th':
+                chain = row_chain
+                while chain is not None:
+                    row_cells[id(chain[0])].append(el)
+                    chain = chain[1]
+            elif name == 'div':
+                divs.append(el)
+                if in_main:
+                    main_divs.append(el)
+                if in_role_main:
+                    role_main_divs.append(el)
+                div_chain = (el, div_chain)
+            elif name == 'span' and not excluded:
+                spans.append(el)
+            
+            # Flag every enclosing div as containing a block element. Once we reach a
+            # flagged div, all of its ancestors were flagged by an earlier element.
+            if name in _BLOCK_TAGS:
+                chain = div_chain
+                while chain is not None and id(chain[0]) not in block_divs:
+                    block_divs.add(id(chain[0]))
+                    chain = chain[1]
+            
+            if name in _SPAN_EXCLUDED_PARENTS:
+                excluded = True
+            
+            for child in reversed(element_children(el)):
+                stack.append((child, div_chain, list_chain, table_chain, row_chain, excluded, in_main, in_role_main))
+        
+        return {
+            "headings": headings,
+            "paragraphs": paragraphs,
+            "lists": lists,
+            "tables": tables,
+            "divs": divs,
+            "spans": spans,
+            "list_items": list_items,
+            "table_rows": table_rows,
+            "row_cells": row_cells,
+            "block_divs": block_divs,
+            "region_divs": main_divs if first_main is not None else (
+                role_main_divs if first_role_main is not None else None
+            ),
+        }
+    
+    def _extract_text(self, nodes: Dict[str, Any], main_content, document, get_text, get_class_attr) -> str:
+        """
+        Build clean text from the elements collected by _collect_nodes.
+        Shared by the lxml fast path and the BeautifulSoup path of process_html.
+        
+        Args:
+            nodes: Element buckets returned by _collect_nodes(main_content)
+            main_content: Content root (usually <body>)
+            document: Whole parsed document (used by the last-resort extraction)
+            get_text: Callable (element, separator) -> stripped text joined by separator
+            get_class_attr: Callable (element) -> class attribute as a string ('' if none)
+            
+        Returns:
+            Clean structured text, or empty string if nothing useful was found
+        """
+        # Step 4: Extract text with a simpler, more aggressive approach
+        # For large HTML like LinkedIn, we need to extract everything first, then clean
+        
+        # First, try to extract structured content (headings, paragraphs, lists)
+        text_parts = []
+        seen_texts = set()  # _norm_key() hashes of texts already emitted
+        
+        # get_text() output is already stripped, so lengths are checked directly. Each
+        # text is lowercased once, and its duplicate key is checked before the noise/JSON
+        # filters: nested LinkedIn wrappers repeat the same text many times over.
+        
+        # Extract headings with their hierarchy
+        for heading, level in nodes["headings"]:
+            text = get_text(heading, ' ')
+            if len(text) > 1:
+                text_lower = text.lower()
+                # Use a normalized text key for duplicate detection
+                text_key = _norm_key(text_lower)
+                if text_key in seen_texts:
+                    continue
+                
+                # Filter out LinkedIn UI noise
+                if self._is_linkedin_ui_noise(text, text_lower):
+                    continue
+                
+                text_parts.append(f"{'#' * level} {text}")
+                seen_texts.add(text_key)
+        
+        # Extract paragraphs
+        for para in nodes["paragraphs"]:
+            text = get_text(para, ' ')
+            if len(text) > 5:
+                text_lower = text.lower()
+                text_key = _norm_key(text_lower)
+                if text_key in seen_texts:
+                    continue
+                
+                # Filter out LinkedIn UI noise and JSON
+                if self._is_linkedin_ui_noise(text, text_lower) or self._is_json_like(text):
+                    continue
+                
+                text_parts.append(text)
+                seen_texts.add(text_key)
+        
+        # Extract list items
+        for list_elem in nodes["lists"]:
+            list_items = []
+            for li in nodes["list_items"][id(list_elem)]:
+                item_text = get_text(li, ' ')
+                if len(item_text) > 2:
+                    text_key = _norm_key(item_text.lower())
+                    if text_key not in seen_texts:
+                        list_items.append(f"- {item_text}")
+                        seen_texts.add(text_key)
+            if list_items:
+                text_parts.append("\n".join(list_items))
+        
+        # Extract table content
+        for table in nodes["tables"]:
+            rows = []
+            for tr in nodes["table_rows"][id(table)]:
+                cells = [get_text(td, ' ') for td in nodes["row_cells"][id(tr)]]
+                if any(cells):
+                    rows.append(" | ".join(cells))
+            if rows:
+                text_parts.append("\n".join(rows))
+        
+        # Step 5: For LinkedIn and similar sites, extract text from divs and spans
+        # This is important because LinkedIn uses lots of nested divs
+        # Extract meaningful div content (not navigation). When the page marks a main
+        # region, only its divs are considered; the rest is site chrome.
+        region_divs = nodes["region_divs"]
+        for div in (region_divs if region_divs is not None else nodes["divs"]):
+            # Skip if it's navigation
+            if _NAV_CLASS_RE.search(get_class_attr(div)):
+                continue
+            
+            # Skip if it contains only other block elements (already processed)
+            if id(div) in nodes["block_divs"]:
+                continue
+            
+            # Get text from div
+            div_text = get_text(div, ' ')
+            if len(div_text) > 10:
+                div_text_lower = div_text.lower()
+                text_key = _norm_key(div_text_lower)
+                if text_key in seen_texts:
+                    continue
+                
+                # Filter out LinkedIn UI noise and JSON
+                if self._is_linkedin_ui_noise(div_text, div_text_lower) or self._is_json_like(div_text):
+                    continue
+                
+                # Filter out obvious non-content (single words, buttons, etc.)
+                if len(div_text.split()) > 2 and not _NAV_BUTTON_RE.match(div_text):
+                    text_parts.append(div_text)
+                    seen_texts.add(text_key)
+        
+        # Extract meaningful span content (for inline text in divs)
+        # (spans inside navigation, buttons or links are already excluded)
+        for span in nodes["spans"]:
+            span_text = get_text(span, ' ')
+            if len(span_text) > 15:
+                span_text_lower = span_text.lower()
+                text_key = _norm_key(span_text_lower)
+                if text_key in seen_texts:
+                    continue
+                
+                # Filter out LinkedIn UI noise and JSON
+                if self._is_linkedin_ui_noise(span_text, span_text_lower) or self._is_json_like(span_text):
+                    continue
+                
+                if len(span_text.split()) > 3:
+                    text_parts.append(span_text)
+                    seen_texts.add(text_key)
+        
+        # Step 6: If we have structured content, combine and clean it
+        if text_parts:
+            # Filter out any JSON-like lines and write the rest straight into one buffer:
+            # lines of a part on consecutive lines, parts separated by a blank line.
+            # Lines are stripped and never empty, so only repeated spaces need cleaning.
+            buffer = io.StringIO()
+            part_separator = ''
+            for part in text_parts:
+                line_separator = part_separator
+                for line in part.split('\n'):
+                    line = line.strip()
+                    if line and not self._is_json_like(line):
+                        if '  ' in line:
+                            line = _SP2_RE.sub(' ', line)  # Normalize spaces
+                        buffer.write(line_separator)
+                        buffer.write(line)
+                        line_separator = '\n'
+                if line_separator == '\n':
+                    part_separator = '\n\n'
+            result = buffer.getvalue()
+            
+            # If we got substantial content, return it
+            if len(result) > 20:
+                return result
+        
+        # Step 7: Fallback - extract all text if structured extraction didn't work
+        # This is important for large, complex HTML
+        all_text = get_text(main_content, '\n')
+        
+        # Clean up the text
+        # Remove excessive newlines
+        all_text = _NL3_RE.sub('\n\n', all_text)
+        # Normalize whitespace
+        all_text = _TAB_RUN_RE.sub(' ', all_text)
+        # Remove very short lines (likely noise) and JSON-like content
+        lines = []
+        for line in all_text.split('\n'):
+            line = line.strip()
+            if line and len(line) > 3 and not self._is_json_like(line):
+                lines.append(line)
+        all_text = '\n'.join(lines)
+        
+        # If we have content, return it
+        if all_text and len(all_text.strip()) > 10:
+            return all_text.strip()
+        
+        # Step 8: Last resort - get everything from the entire document
+        all_text = get_text(document, ' ')
+        all_text = ' '.join(all_text.split())
+        
+        # Filter out JSON-like content from final extraction
+        if self._is_json_like(all_text):
+            # Try to extract lines that aren't JSON
+            lines = all_text.split(' ')
+            filtered_lines = [line for line in lines if not self._is_json_like(line) and len(line.strip()) > 3]
+            all_text = ' '.join(filtered_lines)
+        
+        if all_text and len(all_text) > 10:
+            return all_text
+        
+        return ""
+    
+    def _extract_with_lxml(self, html_content: str) -> str:
+        """
+        Fast path for process_html: parse and walk the document with lxml directly,
+        skipping BeautifulSoup's per-tag Python wrapper objects.
+        
+        Args:
+            html_content: Raw HTML string
+            
+        Returns:
+            Clean structured text (same rules as the BeautifulSoup path)
+            
+        Raises:
+            Exception: If lxml cannot parse the content (caller falls back to BeautifulSoup)
+        """
+        # Comments and processing instructions are kept (not parser-removed): itertext()
+        # skips them, and removing them would merge the text on either side
+        return self._extract_from_tree(lxml_html.document_fromstring(html_content))
+    
+    def _extract_from_tree(self, root) -> str:
+        """
+        Clean an already-parsed lxml tree in place and extract its text.
+        
+        Args:
+            root: Document root (<html>) or a content subtree, e.g. the main area
+                  found by scrape_url
+            
+        Returns:
+            Clean structured text
+        """
+        if root.tag != 'html':
+            # Re-home the subtree under its own <body> so it is walked (and its own
+            # div/table/list rules applied) exactly as if it had been parsed on its own
+            body = etree.Element('body')
+            root.tail = None
+            body.append(root)
+            root = body
+        
+        # Step 1: Remove unwanted subtrees (scripts, styles, etc.), then elements whose
+        # data attributes carry JSON (common in LinkedIn)
+        for element in list(root.iter(*_UNWANTED_TAGS)):
+            _lxml_drop(element)
+        for element in root.xpath('descendant-or-self::*[@data-json-key or @data-json]'):
+            _lxml_drop(element)
+        
+        # Step 2: Remove obvious navigation and site header/footer (same rules as bs4 path)
+        for nav in list(root.iter('nav')):
+            nav_classes = (nav.get('class') or '').split()
+            if nav.find('.//a') is not None or 'menu' in nav_classes or 'navigation' in nav_classes:
+                _lxml_drop(nav)
+        for header in list(root.iter('header', 'footer')):
+            if header.find('.//a') is not None:
+                _lxml_drop(header)
+        
+        # Step 3: Focus on body content
+        main_content = root
+        if root.tag == 'html':
+            main_content = root.find('body')
+            if main_content is None:
+                main_content = root.find('.//main')
+            if main_content is None:
+                main_content = root
+        
+        nodes = self._collect_nodes(main_content)
+        return self._extract_text(
+            nodes, main_content, root,
+            get_text=_lxml_text,
+            get_class_attr=lambda el: el.get('class') or ''
+        )
+    
     def process_html(self, html_content: str, source_name: str = "html_content") -> str:
         """
         Process HTML content and extract clean text.
@@ -146,22 +920,28 @@ class UnstructuredDataProcessor:
         Returns:
             Clean structured text
         """
+        # Drop script/style payloads before the parser has to tokenize them
+        html_content = _RAW_BLOCK_RE.sub(_RAW_BLOCK_PLACEHOLDER, html_content)
+        
+        # Fast path: raw lxml tree, no BeautifulSoup wrappers
         try:
-            # Try lxml parser for better performance with large files, fallback to html.parser
-            try:
-                soup = BeautifulSoup(html_content, 'lxml')
-            except:
-                soup = BeautifulSoup(html_content, 'html.parser')
+            return self._extract_with_lxml(html_content)
+        except Exception:
+            pass
+        
+        try:
+            # lxml (libxml2) builds large DOMs far faster than html.parser; the strainer
+            # skips building Python objects for <head>, <meta>, <link>, ...
+            soup = BeautifulSoup(html_content, 'lxml', parse_only=_BODY_STRAINER)
             
             # Step 1: Remove only truly unwanted elements (scripts, styles, etc.)
             # Don't be too aggressive - we want to preserve content
-            unwanted_tags = ["script", "style", "noscript", "iframe", "svg", "canvas"]
-            for tag in unwanted_tags:
+            for tag in _UNWANTED_TAGS:
                 for element in soup.find_all(tag):
                     element.decompose()
             
             # Remove script tags with JSON data (LinkedIn often embeds JSON in script tags)
-            for script in soup.find_all('script', type=re.compile('application/json|application/ld\+json', re.I)):
+            for script in soup.find_all('script', type=_JSON_SCRIPT_TYPE_RE):
                 script.decompose()
             
             # Remove elements with data attributes that contain JSON (common in LinkedIn)
@@ -188,191 +968,29 @@ class UnstructuredDataProcessor:
             # Step 3: Focus on body content
             main_content = soup.find('body') or soup.find('main') or soup
             
-            # Step 4: Extract text with a simpler, more aggressive approach
-            # For large HTML like LinkedIn, we need to extract everything first, then clean
-            
-            # First, try to extract structured content (headings, paragraphs, lists)
-            text_parts = []
-            seen_texts = set()
-            
-            # Extract headings with their hierarchy
-            for heading in main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                text = heading.get_text(separator=' ', strip=True)
-                if text and len(text.strip()) > 1:
-                    # Filter out LinkedIn UI noise
-                    if self._is_linkedin_ui_noise(text):
-                        continue
-                    
-                    level = int(heading.name[1])
-                    heading_text = f"{'#' * level} {text}"
-                    # Use normalized text for duplicate detection
-                    normalized = re.sub(r'\s+', ' ', text.lower().strip())
-                    if normalized not in seen_texts:
-                        text_parts.append(heading_text)
-                        seen_texts.add(normalized)
-            
-            # Extract paragraphs
-            for para in main_content.find_all('p'):
-                text = para.get_text(separator=' ', strip=True)
-                if text and len(text.strip()) > 5:
-                    # Filter out LinkedIn UI noise and JSON
-                    if self._is_linkedin_ui_noise(text) or self._is_json_like(text):
-                        continue
-                    
-                    normalized = re.sub(r'\s+', ' ', text.lower().strip())
-                    if normalized not in seen_texts:
-                        text_parts.append(text)
-                        seen_texts.add(normalized)
-            
-            # Extract list items
-            for list_elem in main_content.find_all(['ul', 'ol']):
-                list_items = []
-                for li in list_elem.find_all('li', recursive=True):
-                    item_text = li.get_text(separator=' ', strip=True)
-                    if item_text and len(item_text.strip()) > 2:
-                        normalized = re.sub(r'\s+', ' ', item_text.lower().strip())
-                        if normalized not in seen_texts:
-                            list_items.append(f"- {item_text}")
-                            seen_texts.add(normalized)
-                if list_items:
-                    text_parts.append("\n".join(list_items))
-            
-            # Extract table content
-            for table in main_content.find_all('table'):
-                rows = []
-                for tr in table.find_all('tr'):
-                    cells = [td.get_text(separator=' ', strip=True) for td in tr.find_all(['td', 'th'])]
-                    if cells and any(cell.strip() for cell in cells):
-                        row_text = " | ".join(cells)
-                        if row_text.strip():
-                            rows.append(row_text)
-                if rows:
-                    text_parts.append("\n".join(rows))
-            
-            # Step 5: For LinkedIn and similar sites, extract text from divs and spans
-            # This is important because LinkedIn uses lots of nested divs
-            # Extract meaningful div content (not navigation)
-            for div in main_content.find_all('div'):
-                # Skip if it's navigation
-                div_classes = ' '.join(div.get('class', [])).lower()
-                if any(nav_term in div_classes for nav_term in ['nav', 'navbar', 'menu', 'sidebar', 'header', 'footer']):
-                    continue
-                
-                # Skip if it contains only other block elements (already processed)
-                if div.find(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'table']):
-                    continue
-                
-                # Get text from div
-                div_text = div.get_text(separator=' ', strip=True)
-                if div_text and len(div_text.strip()) > 10:
-                    # Filter out LinkedIn UI noise and JSON
-                    if self._is_linkedin_ui_noise(div_text) or self._is_json_like(div_text):
-                        continue
-                    
-                    normalized = re.sub(r'\s+', ' ', div_text.lower().strip())
-                    # Filter out obvious non-content (single words, buttons, etc.)
-                    if (normalized not in seen_texts and 
-                        len(div_text.split()) > 2 and
-                        not re.match(r'^(Home|About|Contact|Login|Sign|Menu|Search|Follow|Share|Like|Comment|Subscribe|Cookie|Accept|Decline|Close|×|←|→|↑|↓|More|Less|Show|Hide)$', div_text.strip(), re.I)):
-                        text_parts.append(div_text)
-                        seen_texts.add(normalized)
-            
-            # Extract meaningful span content (for inline text in divs)
-            for span in main_content.find_all('span'):
-                # Skip if in navigation or button
-                if span.find_parent(['nav', 'button', 'a']):
-                    continue
-                
-                span_text = span.get_text(separator=' ', strip=True)
-                if span_text and len(span_text.strip()) > 15:
-                    # Filter out LinkedIn UI noise and JSON
-                    if self._is_linkedin_ui_noise(span_text) or self._is_json_like(span_text):
-                        continue
-                    
-                    normalized = re.sub(r'\s+', ' ', span_text.lower().strip())
-                    if (normalized not in seen_texts and 
-                        len(span_text.split()) > 3):
-                        text_parts.append(span_text)
-                        seen_texts.add(normalized)
-            
-            # Step 6: If we have structured content, combine and clean it
-            if text_parts:
-                # Filter out any JSON-like content from text_parts before combining
-                filtered_parts = []
-                for part in text_parts:
-                    # Check each line in the part
-                    lines = part.split('\n')
-                    filtered_lines = []
-                    for line in lines:
-                        line = line.strip()
-                        if line and not self._is_json_like(line):
-                            filtered_lines.append(line)
-                    if filtered_lines:
-                        filtered_parts.append('\n'.join(filtered_lines))
-                
-                if filtered_parts:
-                    result = "\n\n".join(filtered_parts)
-                    # Simple cleaning - don't be too aggressive
-                    result = re.sub(r'\n{3,}', '\n\n', result)  # Max 2 newlines
-                    result = re.sub(r' {2,}', ' ', result)  # Normalize spaces
-                    result = result.strip()
-                    
-                    # If we got substantial content, return it
-                    if result and len(result.strip()) > 20:
-                        return result
-            
-            # Step 7: Fallback - extract all text if structured extraction didn't work
-            # This is important for large, complex HTML
-            all_text = main_content.get_text(separator='\n', strip=True)
-            
-            # Clean up the text
-            # Remove excessive newlines
-            all_text = re.sub(r'\n{3,}', '\n\n', all_text)
-            # Normalize whitespace
-            all_text = re.sub(r'[ \t]+', ' ', all_text)
-            # Remove very short lines (likely noise) and JSON-like content
-            lines = []
-            for line in all_text.split('\n'):
-                line = line.strip()
-                if line and len(line) > 3 and not self._is_json_like(line):
-                    lines.append(line)
-            all_text = '\n'.join(lines)
-            
-            # If we have content, return it
-            if all_text and len(all_text.strip()) > 10:
-                return all_text.strip()
-            
-            # Step 8: Last resort - get everything from the entire document
-            all_text = soup.get_text(separator=' ', strip=True)
-            all_text = re.sub(r'\s+', ' ', all_text).strip()
-            
-            # Filter out JSON-like content from final extraction
-            if self._is_json_like(all_text):
-                # Try to extract lines that aren't JSON
-                lines = all_text.split(' ')
-                filtered_lines = [line for line in lines if not self._is_json_like(line) and len(line.strip()) > 3]
-                all_text = ' '.join(filtered_lines)
-            
-            if all_text and len(all_text) > 10:
-                return all_text
-            
-            return ""
+            # Walk the tree once and reuse the collected elements for every extraction pass
+            nodes = self._collect_nodes(main_content)
+            return self._extract_text(
+                nodes, main_content, soup,
+                get_text=lambda el, separator: el.get_text(separator=separator, strip=True),
+                get_class_attr=lambda el: ' '.join(el.get('class', []))
+            )
             
         except Exception as e:
             # Exception fallback: try simple extraction
             try:
-                soup_fallback = BeautifulSoup(html_content, 'html.parser')
+                soup_fallback = BeautifulSoup(html_content, 'lxml')
                 # Remove scripts and styles (including JSON scripts)
                 for tag in soup_fallback(["script", "style", "noscript"]):
                     tag.decompose()
                 
                 # Remove JSON script tags
-                for script in soup_fallback.find_all('script', type=re.compile('application/json|application/ld\+json', re.I)):
+                for script in soup_fallback.find_all('script', type=_JSON_SCRIPT_TYPE_RE):
                     script.decompose()
                 
                 # Get all text
                 text = soup_fallback.get_text(separator=' ', strip=True)
-                text = re.sub(r'\s+', ' ', text).strip()
+                text = ' '.join(text.split())
                 
                 # Filter out JSON-like content
                 if self._is_json_like(text):
@@ -386,10 +1004,9 @@ class UnstructuredDataProcessor:
             except:
                 pass
             
-            # Final fallback: regex-based extraction
-            text = re.sub(r'<[^>]+>', '', html_content)
-            text = html.unescape(text)
-            text = re.sub(r'\s+', ' ', text).strip()
+            # Final fallback: stream the markup through HTMLParser, keeping only text
+            text = _strip_tags(html_content)
+            text = ' '.join(text.split())
             
             # Filter out JSON-like content
             if self._is_json_like(text):
@@ -413,6 +1030,12 @@ class UnstructuredDataProcessor:
         # First, normalize all whitespace within lines
         lines = text.split('\n')
         cleaned_lines = []
+        # Duplicate detection: exact normalized lines, plus the line's words alone
+        # for near-duplicates that differ only in punctuation (O(1) lookups instead
+        # of pairwise scans). Both keys cover the whole line, so lines that merely
+        # share a lead-in ("Step 1: Configure ...") are all kept.
+        seen_exact = set()
+        seen_words = set()
         
         for line in lines:
             # Skip empty lines (we'll add them back strategically)
@@ -420,76 +1043,220 @@ class UnstructuredDataProcessor:
                 continue
             
             # Clean the line: remove excessive spaces, normalize
-            cleaned_line = re.sub(r'[ \t]+', ' ', line.strip())
+            cleaned_line = _TAB_RUN_RE.sub(' ', line.strip())
             
             # Skip very short lines that are likely artifacts
             if len(cleaned_line) < 2:
                 continue
             
             # Skip lines that are just punctuation or symbols
-            if re.match(r'^[^\w\s]+$', cleaned_line):
+            if _PUNCT_ONLY_RE.match(cleaned_line):
                 continue
             
             # Remove excessive leading/trailing whitespace from content
             cleaned_line = cleaned_line.strip()
             
             # Create a normalized version for duplicate detection (lowercase, no extra spaces)
-            normalized = re.sub(r'\s+', ' ', cleaned_line.lower())
+            normalized = ' '.join(cleaned_line.lower().split())
             
-            # Skip duplicate consecutive lines
-            if cleaned_lines and cleaned_line == cleaned_lines[-1].strip():
+            # Skip exact (normalized) duplicates, including consecutive repeats
+            if normalized in seen_exact:
                 continue
             
-            # Skip if we've seen very similar content (fuzzy duplicate detection)
-            # Check if this line is substantially similar to any previous line
-            is_duplicate = False
-            for prev_line in cleaned_lines:
-                prev_normalized = re.sub(r'\s+', ' ', prev_line.lower())
-                # If one is a substantial substring of the other (80% match)
-                if len(normalized) > 30 and len(prev_normalized) > 30:
-                    shorter = min(len(normalized), len(prev_normalized))
-                    longer = max(len(normalized), len(prev_normalized))
-                    if shorter / longer > 0.8:  # 80% similarity
-                        # Check if they're very similar
-                        if normalized[:int(shorter*0.8)] in prev_normalized or prev_normalized[:int(shorter*0.8)] in normalized:
-                            is_duplicate = True
-                            break
-                elif normalized == prev_normalized:
-                    is_duplicate = True
-                    break
-            
-            if is_duplicate:
+            # Skip near-duplicates: the same words with different punctuation
+            words = ' '.join(_WORD_RUN_RE.findall(normalized))
+            if words and words in seen_words:
                 continue
             
+            seen_exact.add(normalized)
+            if words:
+                seen_words.add(words)
+            
             cleaned_lines.append(cleaned_line)
         
-        # Join lines with proper spacing
-        result = '\n'.join(cleaned_lines)
+        # Join lines with proper spacing in a single pass. The lines are already
+        # stripped, single-spaced and non-empty, so the only layout left is a blank
+        # line after headings that sit between two other lines. A heading directly
+        # below a spaced heading stays attached to it (as with the former regex pass).
+        parts = []
+        last = len(cleaned_lines) - 1
+        prev_spaced = False
+        for i, line in enumerate(cleaned_lines):
+            parts.append(line)
+            if i == last:
+                break
+            spaced = 0 < i and not prev_spaced and _HEADING_LINE_RE.match(line) is not None
+            parts.append('\n\n' if spaced else '\n')
+            prev_spaced = spaced
+        
+        return ''.join(parts)
+    
+    def _markdown_text_parts(self, markdown_content: str) -> List[str]:
+        """
+        Extract structured text parts from Markdown in one pass over markdown-it's tokens.
+        
+        Produces the same parts as rendering to HTML and walking the DOM: headings, then
+        paragraphs, then lists, then code, each group in document order. Documents with
+        raw HTML blocks still go through the DOM, which is what interprets that markup.
+        
+        Args:
+            markdown_content: Markdown formatted text
+            
+        Returns:
+            List of text parts
+        """
+        headings, paragraphs, lists, code_blocks = [], [], [], []
+        all_text = []
+        open_lists = []   # items of each ul/ol currently open, innermost last
+        open_items = []   # text nodes of each li currently open, innermost last
+        block = None      # ('heading', level) or ('paragraph', shown) for the next inline token
+        
+        tokens = _MARKDOWN_IT.parse(markdown_content)
+        if any(token.type == 'html_block' for token in tokens):
+            return self._markdown_html_text_parts(markdown_content)
+        
+        for token in tokens:
+            token_type = token.type
+            
+            if token_type == 'inline':
+                nodes = _inline_text_nodes(token.children)
+                if block is not None and block[0] == 'heading':
+                    text = ''.join(nodes)
+                    if text:
+                        headings.append(f"\n{'#' * block[1]} {text}\n")
+                elif block is not None and block[1]:
+                    # Paragraphs in tight lists are not rendered as <p>
+                    text = ' '.join(nodes)
+                    if len(text) > 5:  # Only substantial paragraphs
+                        paragraphs.append(text)
+                
+                # Inline code is extracted as a code block as well
+                for child in token.children or ():
+                    if child.type == 'code_inline' and child.content:
+                        code_blocks.append(f"\n```\n{child.content}\n```\n")
+            elif token_type == 'fence' or token_type == 'code_block':
+                if token.content:
+                    # Rendered as <pre><code>: the DOM walk emits both elements
+                    code_block = f"\n```\n{token.content}\n```\n"
+                    code_blocks.append(code_block)
+                    code_blocks.append(code_block)
+                nodes = [token.content.strip()] if token.content.strip() else []
+            elif token_type == 'heading_open':
+                block = ('heading', int(token.tag[1]))
+                continue
+            elif token_type == 'paragraph_open':
+                block = ('paragraph', not token.hidden)
+                continue
+            elif token_type == 'bullet_list_open' or token_type == 'ordered_list_open':
+                list_items = []
+                lists.append(list_items)
+                open_lists.append(list_items)
+                continue
+            elif token_type == 'bullet_list_close' or token_type == 'ordered_list_close':
+                open_lists.pop()
+                continue
+            elif token_type == 'list_item_open':
+                open_items.append([])
+                continue
+            elif token_type == 'list_item_close':
+                item_text = ' '.join(open_items.pop())
+                if item_text:
+                    open_lists[-1].append(f"- {item_text}")
+                continue
+            else:
+                continue
+            
+            # Text belongs to every enclosing list item (nested lists included)
+            for item_nodes in open_items:
+                item_nodes.extend(nodes)
+            all_text.extend(nodes)
+        
+        text_parts = headings + paragraphs
+        text_parts.extend("\n".join(list_items) for list_items in lists if list_items)
+        text_parts.extend(code_blocks)
+        
+        # If no structured content found, fall back to all text split by double newlines
+        if not text_parts:
+            text_parts = [p.strip() for p in '\n'.join(all_text).split('\n\n') if p.strip()]
+        
+        return text_parts
+    
+    def _markdown_html_text_parts(self, markdown_content: str) -> List[str]:
+        """
+        Extract structured text parts from Markdown by converting it to HTML and walking
+        the DOM (used when markdown-it is not installed).
+        
+        Args:
+            markdown_content: Markdown or Wiki formatted text
+        
+        Returns:
+            List of text parts
+        """
+        # Convert markdown to HTML first, then extract text
+        if MARKDOWN_AVAILABLE and md_lib:
+            html_content = md_lib.markdown(markdown_content)
+        else:
+            # Fallback: treat as plain text with markdown structure
+            html_content = markdown_content
+            # Simple markdown to HTML conversion for basic elements
+            for pattern, replacement in _MD_FALLBACK_RULES:
+                html_content = pattern.sub(replacement, html_content)
+        
+        return self._markdown_dom_text_parts(html_content)
+    
+    def _markdown_dom_text_parts(self, html_content: str) -> List[str]:
+        """
+        Extract structured text parts from Markdown rendered to HTML: headings, then
+        paragraphs, then lists, then code, each group in document order.
+        
+        Args:
+            html_content: HTML rendered from Markdown
         
-        # Normalize multiple newlines (max 2 consecutive)
-        result = re.sub(r'\n{3,}', '\n\n', result)
+        Returns:
+            List of text parts
+        """
+        soup = BeautifulSoup(html_content, 'lxml')
         
-        # Clean up spacing around headings
-        result = re.sub(r'\n(#{1,6}\s+[^\n]+)\n+', r'\n\1\n\n', result)
+        # Extract text while preserving structure
+        text_parts = []
         
-        # Remove excessive spaces between words (but preserve single spaces)
-        result = re.sub(r' {2,}', ' ', result)
+        # Process headings
+        for heading in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+            level = int(heading.name[1])
+            text = heading.get_text(strip=True)
+            if text:
+                text_parts.append(f"\n{'#' * level} {text}\n")
         
-        # Clean up list formatting
-        result = re.sub(r'\n(- [^\n]+)\n+(- [^\n]+)', r'\n\1\n\2', result)
+        # Process paragraphs
+        for para in soup.find_all('p'):
+            text = para.get_text(separator=' ', strip=True)
+            if text and len(text) > 5:  # Only substantial paragraphs
+                text_parts.append(text)
         
-        # Remove trailing whitespace from each line
-        lines = [line.rstrip() for line in result.split('\n')]
-        result = '\n'.join(lines)
+        # Process lists
+        for list_elem in soup.find_all(['ul', 'ol']):
+            list_items = []
+            for li in list_elem.find_all('li', recursive=False):
+                item_text = li.get_text(separator=' ', strip=True)
+                if item_text:
+                    list_items.append(f"- {item_text}")
+            if list_items:
+                text_parts.append("\n".join(list_items))
         
-        # Final normalization: ensure proper paragraph spacing
-        # Headings should have content after them, not just empty lines
-        result = re.sub(r'(#{1,6}\s+[^\n]+)\n\n\n+', r'\1\n\n', result)
+        # Process code blocks (preserve as-is)
+        for code in soup.find_all(['code', 'pre']):
+            code_text = code.get_text()
+            if code_text:
+                text_parts.append(f"\n```\n{code_text}\n```\n")
         
-        # Remove leading/trailing newlines
-        result = result.strip()
+        # If no structured content found, try to extract all text and split by double newlines
+        if not text_parts:
+            all_text = soup.get_text(separator='\n', strip=True)
+            # Split by double newlines to preserve paragraph structure
+            paragraphs = [p.strip() for p in all_text.split('\n\n') if p.strip()]
+            text_parts.extend(paragraphs)
         
-        return result
+        return text_parts
     
     def process_markdown(self, markdown_content: str, source_name: str = "markdown_content") -> str:
         """
@@ -503,68 +1270,19 @@ class UnstructuredDataProcessor:
             Clean structured text (Markdown converted to plain text with structure)
         """
         try:
-            # Convert markdown to HTML first, then extract text
-            if MARKDOWN_AVAILABLE and md_lib:
-                html_content = md_lib.markdown(markdown_content)
+            if MARKDOWN_IT_AVAILABLE:
+                text_parts = self._markdown_text_parts(markdown_content)
             else:
-                # Fallback: treat as plain text with markdown structure
-                html_content = markdown_content
-                # Simple markdown to HTML conversion for basic elements
-                html_content = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html_content, flags=re.MULTILINE)
-                html_content = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html_content, flags=re.MULTILINE)
-                html_content = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html_content, flags=re.MULTILINE)
-                html_content = re.sub(r'^\* (.+)$', r'<li>\1</li>', html_content, flags=re.MULTILINE)
-                html_content = re.sub(r'^- (.+)$', r'<li>\1</li>', html_content, flags=re.MULTILINE)
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Extract text while preserving structure
-            text_parts = []
-            
-            # Process headings
-            for heading in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                level = int(heading.name[1])
-                text = heading.get_text(strip=True)
-                if text:
-                    text_parts.append(f"\n{'#' * level} {text}\n")
-            
-            # Process paragraphs
-            for para in soup.find_all('p'):
-                text = para.get_text(separator=' ', strip=True)
-                if text and len(text) > 5:  # Only substantial paragraphs
-                    text_parts.append(text)
-            
-            # Process lists
-            for list_elem in soup.find_all(['ul', 'ol']):
-                list_items = []
-                for li in list_elem.find_all('li', recursive=False):
-                    item_text = li.get_text(separator=' ', strip=True)
-                    if item_text:
-                        list_items.append(f"- {item_text}")
-                if list_items:
-                    text_parts.append("\n".join(list_items))
-            
-            # Process code blocks (preserve as-is)
-            for code in soup.find_all(['code', 'pre']):
-                code_text = code.get_text()
-                if code_text:
-                    text_parts.append(f"\n```\n{code_text}\n```\n")
-            
-            # If no structured content found, try to extract all text and split by double newlines
-            if not text_parts:
-                all_text = soup.get_text(separator='\n', strip=True)
-                # Split by double newlines to preserve paragraph structure
-                paragraphs = [p.strip() for p in all_text.split('\n\n') if p.strip()]
-                text_parts.extend(paragraphs)
+                text_parts = self._markdown_html_text_parts(markdown_content)
             
             result = "\n\n".join(text_parts)
             # Clean up excessive whitespace
-            result = re.sub(r'\n{3,}', '\n\n', result)
+            result = _NL3_RE.sub('\n\n', result)
             
             # If conversion didn't work well, return original markdown with minimal processing
             if len(result.strip()) < len(markdown_content.strip()) * 0.3:
                 # Just clean up the original markdown
-                cleaned = re.sub(r'\n{3,}', '\n\n', markdown_content.strip())
+                cleaned = _NL3_RE.sub('\n\n', markdown_content.strip())
                 return cleaned
             
             return result.strip()
@@ -587,11 +1305,11 @@ class UnstructuredDataProcessor:
         # Clean up the text
         text = text_content.strip()
         # Normalize whitespace
-        text = re.sub(r'[ \t]+', ' ', text)
+        text = _TAB_RUN_RE.sub(' ', text)
         # Normalize line breaks
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _NL3_RE.sub('\n\n', text)
         # Remove excessive spaces
-        text = re.sub(r' {2,}', ' ', text)
+        text = _SP2_RE.sub(' ', text)
         
         return text.strip()
     
@@ -609,23 +1327,28 @@ class UnstructuredDataProcessor:
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Parse once and extract from the tree in place (no serialize + re-parse)
+            try:
+                document = lxml_html.document_fromstring(response.content)
+            except Exception:
+                return self.process_html(response.text, source_name=url)
             
-            # Remove script and style elements
-            for script in soup(["script", "style", "meta", "link", "nav", "footer", "header"]):
-                script.decompose()
+            # Remove script and style elements. drop_tree() merges the surrounding text,
+            # matching what the old serialize + re-parse round trip produced
+            for element in list(document.iter("script", "style", "meta", "link", "nav", "footer", "header")):
+                element.drop_tree()
             
             # Try to find main content area
-            main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile('content|main|article', re.I))
+            main_content = document.find('.//main')
+            if main_content is None:
+                main_content = document.find('.//article')
+            if main_content is None:
+                main_content = next(
+                    (div for div in document.iter('div') if _CONTENT_CLASS_RE.search(div.get('class') or '')),
+                    None
+                )
             
-            if main_content:
-                html_content = str(main_content)
-            else:
-                html_content = str(soup)
-            
-            # Process the HTML
-            return self.process_html(html_content, source_name=url)
+            return self._extract_from_tree(main_content if main_content is not None else document)
             
         except Exception as e:
             return None
@@ -671,16 +1394,10 @@ class UnstructuredDataProcessor:
             
             # Validate that we got some content
             if not processed_text or len(processed_text.strip()) == 0:
-                # Try a more aggressive extraction as fallback
-                from bs4 import BeautifulSoup
-                soup_fallback = BeautifulSoup(html_content, 'html.parser')
-                # Remove scripts and styles
-                for tag in soup_fallback(["script", "style", "meta", "link"]):
-                    tag.decompose()
-                # Get all text
-                processed_text = soup_fallback.get_text(separator=' ', strip=True)
+                # Try a more aggressive extraction as fallback: all text except scripts and styles
+                processed_text = _visible_text(html_content, _FILE_FALLBACK_DROP_TAGS)
                 # Clean up
-                processed_text = re.sub(r'\s+', ' ', processed_text).strip()
+                processed_text = ' '.join(processed_text.split())
                 
                 # If still empty, return error
                 if not processed_text or len(processed_text.strip()) < 5:
@@ -701,32 +1418,11 @@ class UnstructuredDataProcessor:
             output_filename = html_file_path.stem + '.txt'
             output_path = output_dir / output_filename
             
-            # Save processed text
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(processed_text)
-            
-            # Count paragraphs - improved logic
-            # First try splitting by double newlines
-            paragraphs = [p.strip() for p in processed_text.split('\n\n') if p.strip()]
-            
-            # If no double newlines, try single newlines for substantial content
-            if not paragraphs:
-                paragraphs = [p.strip() for p in processed_text.split('\n') if p.strip() and len(p.strip()) > 10]
-            
-            # If still no paragraphs but we have content, count by sentences or minimum length blocks
-            if not paragraphs and processed_text.strip():
-                # Split by periods and count substantial sentences
-                sentences = [s.strip() for s in processed_text.split('.') if s.strip() and len(s.strip()) > 10]
-                if sentences:
-                    # Group sentences into paragraphs (roughly 2-3 sentences per paragraph)
-                    para_count = max(1, len(sentences) // 2)
-                    paragraphs = ['dummy'] * para_count  # Just for counting
-                else:
-                    # Last resort: if we have any content, count as 1 paragraph
-                    paragraphs = ['dummy'] if len(processed_text.strip()) > 10 else []
+            # Save processed text (encoded once, written in a single call)
+            _write_atomic(output_path, processed_text.encode('utf-8'))
             
-            # Ensure we have at least 1 paragraph if content exists
-            para_count = len(paragraphs) if paragraphs else (1 if len(processed_text.strip()) > 10 else 0)
+            # Count paragraphs (non-blank blocks between blank lines)
+            para_count = _count_paragraphs(processed_text)
             
             return {
                 "success": True,
@@ -747,6 +1443,127 @@ class UnstructuredDataProcessor:
                 "filename": None
             }
     
+    def process_html_files(
+        self,
+        html_file_paths: Iterable[Path],
+        output_dir: Optional[Path] = None,
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several HTML files in parallel worker processes.
+        
+        HTML extraction is CPU-bound, so separate processes let large files parse
+        concurrently. Each worker builds its own processor once and reuses it.
+        
+        Args:
+            html_file_paths: Paths of the HTML files to process
+            output_dir: Directory to save the processed text files (default: next to each HTML file)
+            max_workers: Number of worker processes (default: number of CPUs)
+            
+        Returns:
+            One process_html_file() result dictionary per input path, in input order
+        """
+        html_file_paths = [Path(path) for path in html_file_paths]
+        
+        # Not worth starting a pool for a single file
+        if len(html_file_paths) <= 1 or max_workers == 1:
+            return [self.process_html_file(path, output_dir) for path in html_file_paths]
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                _process_html_file_worker,
+                html_file_paths,
+                [output_dir] * len(html_file_paths)
+            ))
+    
+    def _text_for_save(self, content: str, content_type: str, filename: str) -> Tuple[str, str]:
+        """
+        Process content for saving and pick its output filename.
+        
+        Returns:
+            Tuple of (processed text, safe .txt filename)
+            
+        Raises:
+            ValueError: If the input is empty or no text could be extracted
+        """
+        # Process based on type
+        if content_type == 'html':
+            # Validate input content first
+            if not content or len(content.strip()) < 10:
+                raise ValueError("HTML content is too short or empty. Please provide valid HTML content.")
+            
+            processed_text = self.process_html(content, source_name=filename)
+            # Validate HTML processing result - try multiple fallback strategies.
+            # Both fallbacks read the same lxml tree, parsed at most once.
+            fallback_document = None
+            if not processed_text or len(processed_text.strip()) == 0:
+                # Fallback 1: visible text without scripts, styles and page chrome
+                try:
+                    fallback_document = lxml_html.document_fromstring(content)
+                    processed_text = ' '.join(
+                        text.strip() for text in _SAVE_FALLBACK_TEXT_XPATH(fallback_document) if text.strip()
+                    )
+                except Exception as e:
+                    try:
+                        processed_text = _visible_text(content, _SAVE_FALLBACK_DROP_TAGS)
+                    except Exception as e:
+                        pass
+                processed_text = ' '.join((processed_text or '').split())
+            
+            # Fallback 2: if still empty, take all text (only scripts/styles removed)
+            if not processed_text or len(processed_text.strip()) < 10:
+                if fallback_document is None:
+                    try:
+                        fallback_document = lxml_html.document_fromstring(content)
+                    except Exception as e:
+                        pass
+                if fallback_document is not None:
+                    text = ''.join(_ALL_TEXT_XPATH(fallback_document))
+                else:
+                    # lxml rejected the content: strip the tags directly
+                    text = _strip_tags(content)
+                text = ' '.join(text.split())
+                if text and len(text) > 10:
+                    processed_text = text
+        elif content_type == 'markdown':
+            processed_text = self.process_markdown(content, source_name=filename)
+        elif content_type == 'url':
+            processed_text = self.scrape_url(content)
+            if processed_text is None:
+                raise ValueError(f"Failed to scrape URL: {content}")
+        else:  # 'text' or default
+            processed_text = self.process_plain_text(content, source_name=filename)
+        
+        # Validate processed text
+        if not processed_text or len(processed_text.strip()) == 0:
+            raise ValueError("No content could be extracted from the input. Please check that your input contains readable text.")
+        
+        return processed_text, _safe_filename(filename, content_type)
+    
+    @staticmethod
+    def _save_result(output_path: Path, safe_filename: str, processed_text: str) -> Dict[str, Any]:
+        """Result dictionary for a successfully saved file."""
+        return {
+            "success": True,
+            "file_path": str(output_path),
+            "filename": safe_filename,
+            "content_length": len(processed_text),
+            # Count paragraphs (non-blank blocks between blank lines)
+            "paragraphs": _count_paragraphs(processed_text)
+        }
+    
+    @staticmethod
+    def _save_error(error: str) -> Dict[str, Any]:
+        """Result dictionary for a failed process-and-save."""
+        return {
+            "success": False,
+            "error": error,
+            "file_path": None,
+            "content_length": 0,
+            "paragraphs": 0,
+            "filename": None
+        }
+    
     def process_and_save(
         self, 
         content: str, 
@@ -769,114 +1586,64 @@ class UnstructuredDataProcessor:
             Dictionary with processing results
         """
         try:
-            # Process based on type
-            if content_type == 'html':
-                # Validate input content first
-                if not content or len(content.strip()) < 10:
-                    return {
-                        "success": False,
-                        "error": "HTML content is too short or empty. Please provide valid HTML content.",
-                        "file_path": None,
-                        "content_length": 0,
-                        "paragraphs": 0,
-                        "filename": None
-                    }
-                
-                processed_text = self.process_html(content, source_name=filename)
-                # Validate HTML processing result - try multiple fallback strategies
-                if not processed_text or len(processed_text.strip()) == 0:
-                    # Fallback 1: try basic extraction with BeautifulSoup
-                    try:
-                        from bs4 import BeautifulSoup
-                        soup = BeautifulSoup(content, 'html.parser')
-                        for tag in soup(["script", "style", "meta", "link", "nav", "header", "footer"]):
-                            tag.decompose()
-                        processed_text = soup.get_text(separator=' ', strip=True)
-                        processed_text = re.sub(r'\s+', ' ', processed_text).strip()
-                    except Exception as e:
-                        pass
-                
-                # Fallback 2: if still empty, try regex-based extraction
-                if not processed_text or len(processed_text.strip()) < 10:
-                    # Remove HTML tags with regex
-                    text = re.sub(r'<[^>]+>', '', content)
-                    text = html.unescape(text)
-                    text = re.sub(r'\s+', ' ', text).strip()
-                    if text and len(text) > 10:
-                        processed_text = text
-            elif content_type == 'markdown':
-                processed_text = self.process_markdown(content, source_name=filename)
-            elif content_type == 'url':
-                processed_text = self.scrape_url(content)
-                if processed_text is None:
-                    raise ValueError(f"Failed to scrape URL: {content}")
-            else:  # 'text' or default
-                processed_text = self.process_plain_text(content, source_name=filename)
-            
-            # Validate processed text
-            if not processed_text or len(processed_text.strip()) == 0:
-                return {
-                    "success": False,
-                    "error": "No content could be extracted from the input. Please check that your input contains readable text.",
-                    "file_path": None,
-                    "content_length": 0,
-                    "paragraphs": 0,
-                    "filename": None
-                }
-            
-            # Ensure filename is safe
-            safe_filename = re.sub(r'[^\w\s-]', '', filename).strip()
-            safe_filename = re.sub(r'[-\s]+', '_', safe_filename)
-            if not safe_filename:
-                safe_filename = f"processed_{content_type}"
-            
-            # Add .txt extension if not present
-            if not safe_filename.endswith('.txt'):
-                safe_filename += '.txt'
+            processed_text, safe_filename = self._text_for_save(content, content_type, filename)
             
             # Save to file
             output_path = output_dir / safe_filename
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(processed_text)
-            
-            # Count paragraphs - improved logic
-            # First try splitting by double newlines
-            paragraphs = [p.strip() for p in processed_text.split('\n\n') if p.strip()]
-            
-            # If no double newlines, try single newlines for substantial content
-            if not paragraphs:
-                paragraphs = [p.strip() for p in processed_text.split('\n') if p.strip() and len(p.strip()) > 10]
-            
-            # If still no paragraphs but we have content, count by sentences or minimum length blocks
-            if not paragraphs and processed_text.strip():
-                # Split by periods and count substantial sentences
-                sentences = [s.strip() for s in processed_text.split('.') if s.strip() and len(s.strip()) > 10]
-                if sentences:
-                    # Group sentences into paragraphs (roughly 2-3 sentences per paragraph)
-                    para_count = max(1, len(sentences) // 2)
-                    paragraphs = ['dummy'] * para_count  # Just for counting
-                else:
-                    # Last resort: if we have any content, count as 1 paragraph
-                    paragraphs = ['dummy'] if len(processed_text.strip()) > 10 else []
+            _write_atomic(output_path, processed_text.encode('utf-8'))
             
-            # Ensure we have at least 1 paragraph if content exists
-            para_count = len(paragraphs) if paragraphs else (1 if len(processed_text.strip()) > 10 else 0)
-            
-            return {
-                "success": True,
-                "file_path": str(output_path),
-                "filename": safe_filename,
-                "content_length": len(processed_text),
-                "paragraphs": para_count
-            }
+            return self._save_result(output_path, safe_filename, processed_text)
             
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "file_path": None,
-                "content_length": 0,
-                "paragraphs": 0,
-                "filename": None
-            }
+            return self._save_error(str(e))
+    
+    def process_and_save_many(
+        self,
+        items: Iterable[Tuple[str, str, str]],
+        output_dir: Path,
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several inputs and save each as a structured text file.
+        
+        Inputs are processed in parallel worker processes (like process_html_files())
+        and the output files are then written back to back, instead of interleaving
+        parsing with file I/O per input.
+        
+        Args:
+            items: (content, content_type, filename) tuples, as for process_and_save()
+            output_dir: Directory to save the files
+            max_workers: Number of worker processes (default: number of CPUs)
+            
+        Returns:
+            One process_and_save() result dictionary per item, in input order
+        """
+        items = [tuple(item) for item in items]
+        
+        # Not worth starting a pool for a single input
+        if len(items) <= 1 or max_workers == 1:
+            outcomes = [_text_for_save_worker(item, self) for item in items]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                outcomes = list(executor.map(_text_for_save_worker, items))
+        
+        results: List[Optional[Dict[str, Any]]] = []
+        pending = []  # (result index, output path, processed text)
+        for processed, error in outcomes:
+            if error is not None:
+                results.append(self._save_error(error))
+            else:
+                processed_text, safe_filename = processed
+                pending.append((len(results), output_dir / safe_filename, processed_text))
+                results.append(None)
+        
+        # Write phase
+        for index, output_path, processed_text in pending:
+            try:
+                _write_atomic(output_path, processed_text.encode('utf-8'))
+                results[index] = self._save_result(output_path, output_path.name, processed_text)
+            except Exception as e:
+                results[index] = self._save_error(str(e))
+        
+        return results
 
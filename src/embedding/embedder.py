@@ -3,44 +3,211 @@ Embedding module for converting text blocks into dense vector embeddings.
 Using open-source model: sentence-transformers/all-MiniLM-L6-V2
 """
 
-from typing import List
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Union
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
+# Try to import optimum/ONNX Runtime for int8-quantized CPU inference
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# File written by ORTQuantizer next to the exported model.onnx
+_ONNX_QUANTIZED_FILE = "model_quantized.onnx"
+# sentence-transformers truncates MiniLM inputs at 256 tokens; the ONNX path matches it
+_ONNX_MAX_SEQ_LENGTH = 256
+
+
+# Loaded models are shared by every Embedder in the process, keyed by model name
+# (and device), so creating an Embedder per request does not reload the weights.
+@lru_cache(maxsize=4)
+def _load_model(model_name: str, device: str) -> SentenceTransformer:
+    """Load a sentence transformer on device (in FP16 on the GPU)."""
+    model = SentenceTransformer(model_name, device=device)
+    if device == "cuda":
+        model.half()
+    return model
+
+
+@lru_cache(maxsize=4)
+def _load_onnx_int8(model_name: str, onnx_dir: str):
+    """Load the int8 ONNX model and tokenizer for model_name, exporting and quantizing it on first use."""
+    model_dir = Path(onnx_dir) / model_name.replace("/", "__")
+    if not (model_dir / _ONNX_QUANTIZED_FILE).exists():
+        model = ORTModelForFeatureExtraction.from_pretrained(
+            model_name, export=True, provider="CPUExecutionProvider"
+        )
+        model.save_pretrained(model_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+        quantizer = ORTQuantizer.from_pretrained(model)
+        quantizer.quantize(
+            save_dir=model_dir,
+            quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        )
+    onnx_model = ORTModelForFeatureExtraction.from_pretrained(
+        model_dir, file_name=_ONNX_QUANTIZED_FILE, provider="CPUExecutionProvider"
+    )
+    return onnx_model, AutoTokenizer.from_pretrained(model_dir)
+
 
 class Embedder:
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-V2"):
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-V2",
+        batch_size: int = 64,
+        use_onnx_int8: bool = False,
+        onnx_dir: str = "onnx_models",
+        cache_size: int = 10000
+    ):
         """
         Initialize the embedding model.
-        Loads the model into memory once for reuse.
+        Loads the model into memory once per process and shares it between instances,
+        on the GPU in FP16 when one is available.
+        On CPU, use_onnx_int8 runs a dynamically int8-quantized ONNX export instead
+        (requires optimum[onnxruntime]; the export is cached under onnx_dir).
+
+        Args:
+            model_name (str): Sentence transformer model to load.
+            batch_size (int): Number of texts encoded per forward pass.
+            use_onnx_int8 (bool): Use int8 ONNX Runtime inference on CPU.
+            onnx_dir (str): Directory for the exported/quantized ONNX models.
+            cache_size (int): Number of text embeddings kept in the in-memory LRU cache (0 disables it).
+        """
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        # The embedder is shared by background indexing and search threads
+        self._cache_lock = threading.Lock()
+        self.use_onnx = use_onnx_int8 and ONNX_AVAILABLE and self.device == "cpu"
+        if self.use_onnx:
+            self.model = None
+            self.onnx_model, self.tokenizer = _load_onnx_int8(model_name, str(onnx_dir))
+        else:
+            self.model = _load_model(model_name, self.device)
+
+    def _encode_onnx(self, texts: List[str]) -> np.ndarray:
+        """Mean-pooled, L2-normalized embeddings from the int8 ONNX model."""
+        # Batch texts of similar length together to minimize padding (as
+        # SentenceTransformer.encode does), then restore the input order
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        sorted_texts = [texts[i] for i in order]
+        batches = []
+        for start in range(0, len(sorted_texts), self.batch_size):
+            inputs = self.tokenizer(
+                sorted_texts[start:start + self.batch_size],
+                padding=True,
+                truncation=True,
+                max_length=_ONNX_MAX_SEQ_LENGTH,
+                return_tensors="np"
+            )
+            hidden = self.onnx_model(**inputs).last_hidden_state
+            # Mean pooling over real (non-padding) tokens
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+        embeddings = np.empty((len(texts), batches[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.vstack(batches)
+        return embeddings
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts in batches into L2-normalized numpy vectors."""
+        if self.use_onnx:
+            return self._encode_onnx(texts)
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+
+    def _encode_unique(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode each distinct text once, reusing cached embeddings from earlier calls,
+        and expand the result back to one row per input text.
+        """
+        keys = [hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest() for text in texts]
+        rows = {}
+        missing = {}  # key -> text, in first-occurrence order
+        with self._cache_lock:
+            for key, text in zip(keys, texts):
+                if key in rows or key in missing:
+                    continue
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    rows[key] = cached
+                else:
+                    missing[key] = text
+
+        if missing:
+            encoded = self._encode(list(missing.values()))
+            with self._cache_lock:
+                for key, row in zip(missing, encoded):
+                    rows[key] = row
+                    if self.cache_size > 0:
+                        # Copy, so a cached row doesn't keep the whole batch matrix alive
+                        self._cache[key] = row.copy()
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return np.stack([rows[key] for key in keys])
+
+    def warmup(self) -> None:
+        """
+        Run throwaway encodes so the first real query does not pay one-time setup
+        costs (CUDA context and kernel selection on GPU, ONNX Runtime session init).
+        Bypasses the embedding cache.
         """
-        self.model = SentenceTransformer(model_name)
+        self._encode(["warmup"] * 32)
+        if self.device == "cuda" and self.batch_size > 32:
+            # Also warm the kernels for full production-size batches
+            self._encode(["warmup"] * self.batch_size)
 
-    def encode_texts(self, texts: List[str]) -> List[List[float]]:
+    def encode_texts(self, texts: List[str], as_list: bool = False, dedupe: bool = True) -> Union[np.ndarray, List[List[float]]]:
         """
         Convert a list of text blocks into embeddings.
 
         Args:
             texts (List[str]): Multiple text blocks.
+            as_list (bool): Return Python lists instead of a numpy array.
+            dedupe (bool): Encode repeated texts only once (and reuse cached embeddings).
 
         Returns:
-            List[List[float]]: Embedding vectors for each text block.
+            np.ndarray: Embedding matrix with one row per text block
+            (List[List[float]] when as_list is True).
         """
         if not texts:
             raise ValueError("Input text list cannot be empty")
 
-        return self.model.encode(texts, convert_to_numpy=True).tolist()
+        embeddings = self._encode_unique(texts) if dedupe else self._encode(texts)
+        return embeddings.tolist() if as_list else embeddings
 
-    def encode_text(self, text: str) -> List[float]:
+    def encode_text(self, text: str, as_list: bool = False) -> Union[np.ndarray, List[float]]:
         """
         Convert a single text block into embedding.
 
         Args:
             text (str): Input text to embed.
+            as_list (bool): Return a Python list instead of a numpy array.
 
         Returns:
-            List[float]: Embedding vector.
+            np.ndarray: Embedding vector (List[float] when as_list is True).
         """
         if not text or not text.strip():
             raise ValueError("Input text cannot be empty")
 
-        return self.model.encode([text], convert_to_numpy=True)[0].tolist()
+        embedding = self._encode_unique([text])[0]
+        return embedding.tolist() if as_list else embedding
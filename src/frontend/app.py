@@ -1,36 +1,57 @@
 import streamlit as st
 import sys
+import re
 import pathlib
+from pathlib import Path
 ROOT_DIR = pathlib.Path(__file__).resolve().parents[2]
 sys.path.append(str(ROOT_DIR))
 
 
 from src.hybrid_query.hybrid_retriever import HybridRetriever
 from src.utils.config import DATA_DIR
-# Import vector DB config with fallback for Streamlit caching issues
-try:
-    from src.utils.config import VECTOR_DB_TYPE, VECTOR_DB_DIR
-except ImportError:
-    # Fallback if config hasn't been reloaded
-    import importlib
-    import src.utils.config as config_module
-    importlib.reload(config_module)
-    VECTOR_DB_TYPE = getattr(config_module, 'VECTOR_DB_TYPE', 'local')
-    VECTOR_DB_DIR = getattr(config_module, 'VECTOR_DB_DIR', 'vector_db_store')
+
+# Vector DB config, cached so the fallback config reload runs at most once per process
+@st.cache_resource
+def get_vector_db_config():
+    # Import vector DB config with fallback for Streamlit caching issues
+    try:
+        from src.utils.config import VECTOR_DB_TYPE, VECTOR_DB_DIR
+    except ImportError:
+        # Fallback if config hasn't been reloaded
+        import importlib
+        import src.utils.config as config_module
+        importlib.reload(config_module)
+        VECTOR_DB_TYPE = getattr(config_module, 'VECTOR_DB_TYPE', 'local')
+        VECTOR_DB_DIR = getattr(config_module, 'VECTOR_DB_DIR', 'vector_db_store')
+    return VECTOR_DB_TYPE, VECTOR_DB_DIR
+
+VECTOR_DB_TYPE, VECTOR_DB_DIR = get_vector_db_config()
+
 from src.ingestion.ingest_pipeline import IngestionPipeline
 from src.data_processor.unstructured_processor import UnstructuredDataProcessor
 from src.graph_db.graph_loader import GraphLoader
-from src.embedding.embedder import Embedder
 from src.vector_db import get_vector_db
-from src.utils.config import EMBEDDING_MODEL_NAME
-import tempfile
+from src.utils.config import PARALLEL_INGEST
+import io
 import os
+import html
+import mmap
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import importlib
 import sys
 import random
 
-# Force reload graph_loader module to ensure latest version (for development)
-if 'src.graph_db.graph_loader' in sys.modules:
+try:
+    from csscompressor import compress as compress_css
+    CSSCOMPRESSOR_AVAILABLE = True
+except ImportError:
+    CSSCOMPRESSOR_AVAILABLE = False
+
+# Force reload graph_loader module to ensure latest version (for development, set
+# DEV_RELOAD=1 - otherwise every script rerun would re-execute the module)
+if os.getenv("DEV_RELOAD") == "1" and 'src.graph_db.graph_loader' in sys.modules:
     importlib.reload(sys.modules['src.graph_db.graph_loader'])
     from src.graph_db.graph_loader import GraphLoader
 
@@ -38,60 +59,216 @@ if 'src.graph_db.graph_loader' in sys.modules:
 @st.cache_resource
 def init_services():
     retriever = HybridRetriever(top_k_vectors=10, top_k_final=3)
+    # Warm up the embedding model so the first search is not slowed by one-time setup
+    try:
+        retriever.embedder.warmup()
+    except Exception as e:
+        # Warmup is only an optimization - a failure must not stop the app, but the same
+        # problem (broken ONNX export, GPU out of memory, ...) will hit the first search
+        st.warning(f"Embedding model warmup failed: {e}")
     return retriever
 
 # Initialize services
 retriever = init_services()
 
+# Ingestion pipeline - cached so the spaCy model loads once
+@st.cache_resource
+def get_ingestion_pipeline():
+    return IngestionPipeline()
+
+# Parsed documents for the search results, keyed by path and modification time so
+# each file is parsed once (not once per result and rerun) until it changes
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_document_content(path: str, mtime: float):
+    """
+    Parse a document and index its paragraphs.
+    Returns (doc_content, id_index, text_index, prefix_index): the index of the first
+    paragraph with each id, and of the first non-empty paragraph with each stripped
+    text, and the indexes of the paragraphs (over 50 characters) by their first 100
+    stripped characters.
+    """
+    doc_content = get_ingestion_pipeline().run(path)
+    id_index = {}
+    text_index = {}
+    prefix_index = {}
+    for i, para in enumerate(doc_content.get("paragraphs", [])):
+        id_index.setdefault(para.get("id"), i)
+        para_text = para.get("text", "").strip()
+        if para_text:
+            text_index.setdefault(para_text, i)
+        if len(para_text) > 50:
+            prefix_index.setdefault(para_text[:100], []).append(i)
+    return doc_content, id_index, text_index, prefix_index
+
+# Indexing components - cached so the spaCy model loads and Memgraph connects once
+# (use "Reload Services" after starting Memgraph). Documents are embedded with the
+# retriever's embedder, so indexing and queries share one model.
+@st.cache_resource
+def init_indexing_services():
+    pipeline = get_ingestion_pipeline()
+    graph_loader = GraphLoader()
+    # Background indexing jobs share the loader's connection one at a time
+    graph_lock = threading.Lock()
+    return pipeline, graph_loader, graph_lock
+
+# Helper function to store a document in graph DB (runs in a background thread)
+def load_document_graph(doc_content):
+    """Store a document's nodes and relationships in graph DB, if it is available."""
+    _, graph_loader, graph_lock = init_indexing_services()
+    try:
+        with graph_lock:
+            graph_loader.load_document(doc_content)
+    except Exception as e:
+        # Graph DB might not be available, continue without it
+        pass
+
 # Helper function to process and index documents
-def process_and_index_document(file_path: str):
-    """Process a document and index it in vector DB and graph DB."""
+def process_and_index_documents(files):
+    """
+    Process documents and index them in vector DB and graph DB.
+    files holds (file_path, data) pairs; if data is given it holds the file's bytes,
+    which are ingested from memory. The paragraphs of all documents are embedded in
+    one call, so a batch of uploads fills the encoder batches and pays its setup once.
+    """
     # Initialize components
-    pipeline = IngestionPipeline()
-    embedder = Embedder(model_name=EMBEDDING_MODEL_NAME)
-    graph_loader = GraphLoader()
+    pipeline, _, _ = init_indexing_services()
+    embedder = retriever.embedder
     
     # Use retriever's vector DB (or get a new one if needed)
     vector_db = retriever.vector_db
     
-    # Step 1: Ingest document
-    doc_content = pipeline.run(file_path)
+    # Step 1: Ingest documents
+    doc_contents = []
+    for file_path, data in files:
+        if data is not None:
+            doc_contents.append(pipeline.run_bytes(data, os.path.basename(file_path)))
+        else:
+            doc_contents.append(pipeline.run(file_path))
     
-    # Step 2: Create embeddings for paragraphs
-    paragraphs = doc_content.get("paragraphs", [])
-    if paragraphs:
-        texts = [para.get("text", "") for para in paragraphs]
-        embeddings = embedder.encode_texts(texts)
+    # The graph DB writes (Step 4) are independent of the embeddings, so they run in
+    # the background while the paragraphs are embedded and stored in vector DB
+    with ThreadPoolExecutor(max_workers=1) as graph_executor:
+        graph_futures = [graph_executor.submit(load_document_graph, doc_content) for doc_content in doc_contents]
         
-        # Add embeddings to paragraphs
-        for para, emb in zip(paragraphs, embeddings):
-            para["embedding"] = emb
-    
-    # Step 3: Store in vector DB
-    doc_id = os.path.basename(file_path)
-    vector_db.add_document(doc_id, doc_content)
-    
-    # Reload vector DB to ensure latest data is available
-    if hasattr(vector_db, 'reload'):
-        vector_db.reload()
+        # Step 2: Create embeddings for the paragraphs of all documents (one call: the
+        # embedder length-sorts the texts into batches and returns them in order). The
+        # result is one (n_paragraphs, dim) array; each document gets a slice of its rows
+        texts = [para.get("text", "") for doc_content in doc_contents for para in doc_content.get("paragraphs", [])]
+        embeddings = embedder.encode_texts(texts) if texts else None
+        
+        # Step 3: Store in vector DB (all paragraphs of a document in one batch). This is
+        # the retriever's own instance, so the new data is searchable without a reload
+        doc_infos = []
+        offset = 0
+        for (file_path, _), doc_content in zip(files, doc_contents):
+            doc_id = os.path.basename(file_path)
+            n_paragraphs = len(doc_content.get("paragraphs", []))
+            if n_paragraphs:
+                vector_db.add_document(doc_id, doc_content, embeddings=embeddings[offset:offset + n_paragraphs])
+            offset += n_paragraphs
+            doc_infos.append({
+                "metadata": doc_content.get("metadata", {}),
+                "paragraphs": doc_content.get("paragraphs", []),
+                "entities": doc_content.get("entities", []),
+                "relationships": doc_content.get("relationships", []),
+                "source": doc_content.get("source", doc_id)
+            })
+        
+        # Step 4: Wait for the graph DB writes
+        for graph_future in graph_futures:
+            graph_future.result()
     
-    # Step 4: Store in graph DB
-    try:
-        graph_loader.load_document(doc_content)
-    except Exception as e:
-        # Graph DB might not be available, continue without it
-        pass
+    # Return document info, one per file
+    return doc_infos
+
+# Uploads smaller than this are ingested from memory rather than from the saved file
+MAX_IN_MEMORY_INGEST_BYTES = 8 * 1024 * 1024
+
+# Background indexing executor - cached so running jobs survive script reruns.
+# One worker: jobs share the vector DB, embedder and ingestion pipeline, which are not
+# thread-safe, so they run one after another.
+@st.cache_resource
+def get_index_executor():
+    return ThreadPoolExecutor(max_workers=1)
+
+# Helper function to show the result of an indexed document
+def show_index_result(doc_info):
+    """Show the indexing summary for a document."""
+    st.success(f"Document successfully indexed in Vector+Graph DB!")
+    st.json(doc_info["metadata"])
+    st.info(f"Indexed: {len(doc_info['paragraphs'])} paragraphs, {len(doc_info.get('entities', []))} entities, {len(doc_info.get('relationships', []))} relationships")
     
-    # Return document info
-    return {
-        "metadata": doc_content.get("metadata", {}),
-        "paragraphs": paragraphs,
-        "entities": doc_content.get("entities", []),
-        "relationships": doc_content.get("relationships", []),
-        "source": doc_content.get("source", doc_id)
-    }
+    # Show where data is stored (dynamic based on vector DB type)
+    _, storage_info, _ = get_vector_db_info()
+    st.info(f"Data stored in: {storage_info}")
+
+# Helper function to index documents (in the background when PARALLEL_INGEST is on)
+def index_documents(files, spinner_text: str = "Processing document..."):
+    """
+    Index (file_path, data) pairs now, or queue them as one job so the page stays
+    responsive while it runs.
+    """
+    if PARALLEL_INGEST:
+        job_name = ", ".join(os.path.basename(file_path) for file_path, _ in files)
+        st.session_state.index_jobs[job_name] = get_index_executor().submit(process_and_index_documents, files)
+        st.info(f"Indexing `{job_name}` in the background - you can keep working meanwhile.")
+    else:
+        with st.spinner(spinner_text):
+            doc_infos = process_and_index_documents(files)
+        for doc_info in doc_infos:
+            show_index_result(doc_info)
+
+# Helper function to report background indexing jobs
+def show_index_jobs():
+    """Show running background indexing jobs, and the result of finished ones (once)."""
+    for job_name, future in list(st.session_state.index_jobs.items()):
+        if not future.done():
+            with st.status(f"Indexing `{job_name}`...", state="running"):
+                st.write("Ingesting, embedding and storing in Vector+Graph DB")
+            continue
+        
+        del st.session_state.index_jobs[job_name]
+        error = future.exception()
+        if error is not None:
+            st.error(f"Error indexing `{job_name}`: {error}")
+        else:
+            st.caption(f"Finished indexing `{job_name}`")
+            for doc_info in future.result():
+                show_index_result(doc_info)
+
+# Non-blank text between periods (one match per sentence)
+_SENTENCE_RE = re.compile(r'[^.\s][^.]*')
 
-# Helper function to get vector DB info
+# Helper function to count sentences without splitting the text into a list
+def count_sentences(text: str) -> int:
+    """Count the non-blank '.'-separated segments of text."""
+    return sum(1 for _ in _SENTENCE_RE.finditer(text))
+
+# One match per whitespace-separated word (same words as str.split())
+_WORD_RE = re.compile(r'\S+')
+
+TextStats = namedtuple("TextStats", ["chars", "words", "sentences"])
+
+# Helper function to compute the statistics shown for a text, without building word lists
+def text_stats(text: str) -> TextStats:
+    """Count the characters, words and sentences of text."""
+    return TextStats(len(text), sum(1 for _ in _WORD_RE.finditer(text)), count_sentences(text))
+
+# Helper function to show read-only text in a scrollable box. Lighter for the browser
+# than a disabled st.text_area: plain HTML, no widget state, sized to its content
+def show_scrollbox(text: str, max_height: int = 500, tooltip: str = None):
+    """Show text (escaped, line breaks kept) in a box that scrolls beyond max_height pixels."""
+    # One line of HTML, so blank lines in the text can't end the HTML block in markdown
+    body = html.escape(text).replace("\n", "<br>")
+    title = f' title="{html.escape(tooltip)}"' if tooltip else ""
+    st.markdown(
+        f'<div{title} style="max-height:{max_height}px;overflow:auto;white-space:pre-wrap;'
+        f'padding:0.75rem;border:1px solid rgba(128,128,128,0.35);border-radius:8px;">{body}</div>',
+        unsafe_allow_html=True
+    )
+
+# Helper function to get vector DB info (fixed for the process, so built once)
+@st.cache_resource
 def get_vector_db_info():
     """Get information about the active vector DB backend."""
     db_type = VECTOR_DB_TYPE
@@ -106,10 +283,8 @@ def get_vector_db_info():
     
     return db_name, storage_info, db_type
 
-# CSS styling function
-def set_blue_dots_background():
-    """Apply professional black-complementary gradient theme to the Streamlit app."""
-    st.markdown("""
+# Page CSS: app theme and the translucent navbar
+_THEME_CSS = """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&display=swap');
     
@@ -332,21 +507,9 @@ def set_blue_dots_background():
         }
     }
     </style>
-    """, unsafe_allow_html=True)
-
-# Apply CSS styling
-set_blue_dots_background()
-
-# Initialize session state for tracking uploads and weights
-if 'file_uploaded' not in st.session_state:
-    st.session_state.file_uploaded = False
-if 'vector_weight' not in st.session_state:
-    st.session_state.vector_weight = 0.6
-if 'graph_weight' not in st.session_state:
-    st.session_state.graph_weight = 0.4
+    """
 
-# Single horizontal translucent navbar with both buttons
-st.markdown("""
+_NAVBAR_CSS = """
 <style>
     /* Single horizontal translucent navbar container */
     .navbar-horizontal {
@@ -425,7 +588,45 @@ st.markdown("""
         width: auto !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Both stylesheets go out as one markdown element per rerun
+_PAGE_CSS = _THEME_CSS + _NAVBAR_CSS
+
+_STYLE_BLOCK_RE = re.compile(r'<style>(.*?)</style>', re.S)
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_PUNCT_SPACE_RE = re.compile(r'\s*([{};,])\s*')
+
+def minify_css(css: str) -> str:
+    """Minify a stylesheet (csscompressor if installed, else drop comments and whitespace)."""
+    if CSSCOMPRESSOR_AVAILABLE:
+        return compress_css(css)
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = ' '.join(css.split())
+    return _CSS_PUNCT_SPACE_RE.sub(r'\1', css).strip()
+
+# Page CSS is static - minify it once per process, not on every rerun
+@st.cache_resource
+def get_page_css():
+    return ''.join(f"<style>{minify_css(css)}</style>" for css in _STYLE_BLOCK_RE.findall(_PAGE_CSS))
+
+# CSS styling function
+def set_blue_dots_background():
+    """Apply professional black-complementary gradient theme (and navbar styling) to the Streamlit app."""
+    st.markdown(get_page_css(), unsafe_allow_html=True)
+
+# Apply CSS styling
+set_blue_dots_background()
+
+# Initialize session state for tracking uploads and weights
+if 'file_uploaded' not in st.session_state:
+    st.session_state.file_uploaded = False
+if 'vector_weight' not in st.session_state:
+    st.session_state.vector_weight = 0.6
+if 'graph_weight' not in st.session_state:
+    st.session_state.graph_weight = 0.4
+if 'index_jobs' not in st.session_state:
+    st.session_state.index_jobs = {}  # job name -> Future of a background indexing job
 
 # Single horizontal navbar container with both buttons
 col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
@@ -438,16 +639,28 @@ if login_btn:
     st.info("Login functionality - to be implemented")
 if clear_cache_btn:
     st.cache_resource.clear()
+    load_document_content.clear()
     st.session_state.file_uploaded = False
     st.rerun()
 
 st.title("GraphVectorRAG.com")
 
+# Background indexing status - polled every few seconds while jobs are running
+if st.session_state.index_jobs:
+    if hasattr(st, "fragment"):
+        st.fragment(run_every=2)(show_index_jobs)()
+    else:
+        show_index_jobs()
+        st.button("Refresh indexing status", key="refresh_index_jobs")
+
 # Animated workflow arrow component - Scribble style (defined outside conditional)
+# Cached across reruns: the SVG only depends on the arguments
+@st.cache_data
 def generate_scribble_arrow_svg(arrow_id, width=60, height=20):
     """Generate a hand-drawn style animated arrow as SVG."""
     # Fixed seed for consistent look but slight variation per arrow
-    random.seed(arrow_id * 42)
+    # (own generator, so the global random state is left alone)
+    rng = random.Random(arrow_id * 42)
     
     # Arrow line coordinates with slight jitter
     x1, y1 = 5, height // 2
@@ -460,7 +673,7 @@ def generate_scribble_arrow_svg(arrow_id, width=60, height=20):
         t = i / steps
         x = x1 + (x2 - x1) * t
         # Add subtle vertical jitter for hand-drawn effect
-        jitter = random.uniform(-2, 2) if i > 0 and i < steps else 0
+        jitter = rng.uniform(-2, 2) if i > 0 and i < steps else 0
         y = y1 + jitter
         path_points.append(f"{x:.1f},{y:.1f}")
     
@@ -513,45 +726,258 @@ if st.session_state.file_uploaded:
     </div>
     """, unsafe_allow_html=True)
 
+# Helper function to stat a file once (os.stat_result, or None if it doesn't exist)
+def stat_or_none(path):
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+# Helper function to show a retrieved paragraph with its surrounding context
+def show_paragraph_context(paragraph_id, context_paragraphs):
+    """Show (label, text) context paragraphs with their statistics."""
+    st.subheader(f"Paragraph {paragraph_id} with Surrounding Context")
+    st.info("Showing the retrieved paragraph along with its surrounding context for better understanding.")
+    
+    # Show each paragraph in the context
+    context_stats = [text_stats(t) for _, t in context_paragraphs]
+    for (context_label, context_text), stats in zip(context_paragraphs, context_stats):
+        st.markdown(f"**{context_label}:**")
+        show_scrollbox(
+            context_text,
+            max_height=600,  # Keep reasonable max height
+            tooltip=f"{context_label} ({stats.chars} characters, {stats.words} words)"
+        )
+    
+    # Show comprehensive statistics
+    total_chars = sum(stats.chars for stats in context_stats)
+    total_words = sum(stats.words for stats in context_stats)
+    total_sentences = sum(stats.sentences for stats in context_stats)
+    st.caption(f"**Total Context Statistics:** {total_chars:,} characters | {total_words:,} words | {total_sentences} sentences | {len(context_paragraphs)} paragraphs")
+
+# Helper function to show document metadata (inside the source paragraph expander,
+# and expanders can't be nested - so a collapsed JSON view instead)
+def show_document_metadata(doc_metadata):
+    st.markdown("**Document Metadata:**")
+    st.json(doc_metadata, expanded=False)
+
+# Helper function to show a retrieved paragraph with the neighbor paragraphs stored
+# next to it in the vector DB at indexing time - no document parse needed
+def show_stored_paragraph_context(paragraph_id, full_text, stored_metadata):
+    context_paragraphs = []
+    if stored_metadata["prev_text"]:
+        context_paragraphs.append(("Previous Paragraph", stored_metadata["prev_text"]))
+    context_paragraphs.append(("Current Paragraph (Retrieved)", full_text))
+    if stored_metadata["next_text"]:
+        context_paragraphs.append(("Next Paragraph", stored_metadata["next_text"]))
+    show_paragraph_context(paragraph_id or 'N/A', context_paragraphs)
+    show_document_metadata(stored_metadata.get("metadata", {}))
+
+# Helper function to show the retrieved paragraph in its source document (with the
+# surrounding paragraphs). With on_demand, the document is parsed only once the user
+# asks for it - this needs st.fragment, as a full rerun would drop the search results
+def show_source_paragraph(idx, filename, doc_file_path, doc_file_stat, paragraph_id, full_text, full_text_stats, on_demand=True):
+    loaded_key = f"source_loaded_{idx}_{filename}_{paragraph_id}"
+    if on_demand and not st.session_state.get(loaded_key):
+        if not st.button("Load paragraph context", key=f"load_source_{idx}"):
+            return
+        st.session_state[loaded_key] = True
+    
+    try:
+        # Read document content (paragraphs indexed by id and text)
+        doc_content, id_index, text_index, prefix_index = load_document_content(str(doc_file_path), doc_file_stat.st_mtime)
+        
+        # Find the specific paragraph that was retrieved
+        paragraphs = doc_content.get("paragraphs", [])
+        retrieved_paragraph = None
+        
+        # Try to find the paragraph by paragraph_id
+        if paragraph_id and paragraph_id in id_index:
+            retrieved_paragraph = paragraphs[id_index[paragraph_id]]
+        
+        # If not found by ID, try to find by matching text
+        if not retrieved_paragraph and full_text.strip() in text_index:
+            retrieved_paragraph = paragraphs[text_index[full_text.strip()]]
+        
+        # Display the retrieved paragraph with surrounding context
+        if retrieved_paragraph:
+            para_text = retrieved_paragraph.get("text", "")
+            
+            # Index of the retrieved paragraph, to get surrounding context
+            para_index = id_index.get(retrieved_paragraph.get("id"))
+            
+            # Build extended context with previous and next paragraphs
+            context_paragraphs = []
+            if para_index is not None:
+                # Include previous paragraph if available
+                if para_index > 0:
+                    prev_para = paragraphs[para_index - 1]
+                    context_paragraphs.append(("Previous Paragraph", prev_para.get("text", "")))
+                
+                # Current paragraph
+                context_paragraphs.append(("Current Paragraph (Retrieved)", para_text))
+                
+                # Include next paragraph if available
+                if para_index < len(paragraphs) - 1:
+                    next_para = paragraphs[para_index + 1]
+                    context_paragraphs.append(("Next Paragraph", next_para.get("text", "")))
+            else:
+                context_paragraphs.append(("Retrieved Paragraph", para_text))
+            
+            # Display with context
+            show_paragraph_context(retrieved_paragraph.get('id', 'N/A'), context_paragraphs)
+        else:
+            # Fallback: show the full text we retrieved with context
+            st.subheader("Retrieved Content (Full Text)")
+            
+            # Try to find similar paragraphs for context - first the paragraphs
+            # starting like the retrieved text (a hash lookup)
+            similar_paragraphs = [paragraphs[i] for i in prefix_index.get(full_text.strip()[:100], [])[:3]]
+            if not similar_paragraphs:
+                for para in paragraphs:
+                    para_text = para.get("text", "").strip()
+                    # If paragraph text contains significant overlap with retrieved text
+                    if para_text and len(para_text) > 50:
+                        # Check for overlap (simple substring check)
+                        if full_text[:100] in para_text or para_text[:100] in full_text:
+                            similar_paragraphs.append(para)
+                            if len(similar_paragraphs) >= 3:  # Limit to 3 similar paragraphs
+                                break
+            
+            # Display retrieved text with similar paragraphs if found
+            if similar_paragraphs:
+                st.info(f"Found {len(similar_paragraphs)} related paragraphs from the document for context:")
+                for sim_para in similar_paragraphs:
+                    sim_text = sim_para.get("text", "")
+                    st.markdown(f"**Related Paragraph {sim_para.get('id', 'N/A')}:**")
+                    show_scrollbox(sim_text, max_height=600)
+            else:
+                show_scrollbox(
+                    full_text,
+                    max_height=800,  # Original max height
+                    tooltip=f"Complete retrieved content ({full_text_stats.chars} characters, {full_text_stats.words} words)"
+                )
+            
+            # Show comprehensive statistics
+            st.caption(f"**Statistics:** {full_text_stats.chars:,} characters | {full_text_stats.words:,} words | {full_text_stats.sentences} sentences")
+            st.info("Note: Could not locate exact paragraph in document. Showing retrieved content.")
+        
+        # Show document metadata
+        show_document_metadata(doc_content.get("metadata", {}))
+    except Exception as e:
+        st.error(f"Error reading document: {e}")
+        # Fallback: try to read as plain text
+        try:
+            if doc_file_path.suffix.lower() == ".txt":
+                # Search the memory-mapped file (C-level byte search, no full read + decode)
+                needle_text = full_text.strip()
+                needle = needle_text.encode("utf-8")
+                context = None
+                if doc_file_stat.st_size > 0:
+                    with open(doc_file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        # Try to find the paragraph in the content
+                        idx_pos = mm.find(needle)
+                        if idx_pos != -1:
+                            # Show some context around the paragraph: 100 characters before, and
+                            # after it up to where the unstripped text + 100 would end (UTF-8
+                            # characters are at most 4 bytes)
+                            after_chars = len(full_text) - len(needle_text) + 100
+                            end_pos = idx_pos + len(needle)
+                            before = mm[max(0, idx_pos - 400):idx_pos].decode("utf-8", errors="ignore")[-100:]
+                            after = mm[end_pos:end_pos + 4 * after_chars].decode("utf-8", errors="ignore")[:after_chars]
+                            context = before + needle_text + after
+                if context is not None:
+                    show_scrollbox(context, max_height=300)
+                else:
+                    show_scrollbox(full_text, max_height=300)
+        except:
+            st.warning("Could not display document content.")
+
+# Slider callback: auto-normalize the search weights to sum to 1.0. Runs before the
+# rerun that the slider change triggers, so the whole script sees normalized weights
+def normalize_weights():
+    vector_weight = st.session_state.vector_weight_slider
+    graph_weight = st.session_state.graph_weight_slider
+    total = vector_weight + graph_weight
+    if total > 0:
+        vector_weight, graph_weight = vector_weight / total, graph_weight / total
+    st.session_state.vector_weight = vector_weight
+    st.session_state.graph_weight = graph_weight
+
+# Helper function to identify an upload (same key = same file, across reruns)
+def get_upload_key(uploaded_file):
+    return (getattr(uploaded_file, "file_id", None), uploaded_file.name, uploaded_file.size)
+
+# Helper function to check for HTML files
+def is_html_filename(filename: str) -> bool:
+    return filename.lower().endswith('.html') or filename.lower().endswith('.htm')
+
 # ---------------------------------------------
 # Upload section
 # ---------------------------------------------
-uploaded_file = st.file_uploader("Upload a document", type=["txt", "pdf", "csv", "docx", "html"])
+uploaded_files = st.file_uploader("Upload documents", type=["txt", "pdf", "csv", "docx", "html"], accept_multiple_files=True)
 
-if uploaded_file:
+if uploaded_files:
     # Mark that a file has been uploaded
     st.session_state.file_uploaded = True
-    file_path = DATA_DIR / uploaded_file.name
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
-
-    st.success(f"Uploaded: {uploaded_file.name}")
+    saved_uploads = st.session_state.setdefault("saved_uploads", {})
+    html_results = st.session_state.setdefault("html_results", {})  # name -> (upload key, process_html_file() result)
+    files_to_index = []  # (file_path, data) pairs, indexed together by one button
     
-    # Check if uploaded file is HTML
-    is_html_file = uploaded_file.name.lower().endswith('.html') or uploaded_file.name.lower().endswith('.htm')
-    processed_html_path = None
+    # Save each upload once, not again on every rerun of the script
+    for uploaded_file in uploaded_files:
+        file_path = DATA_DIR / uploaded_file.name
+        if saved_uploads.get(uploaded_file.name) != get_upload_key(uploaded_file) or not file_path.exists():
+            with open(file_path, "wb") as f:
+                f.write(uploaded_file.getbuffer())
+            saved_uploads[uploaded_file.name] = get_upload_key(uploaded_file)
     
-    if is_html_file:
-        # Automatically process HTML file
+    # Automatically process new HTML uploads - all at once, in parallel worker processes
+    # (extraction is CPU-bound), and not again on every rerun of the script
+    pending_html = [
+        uploaded_file for uploaded_file in uploaded_files
+        if is_html_filename(uploaded_file.name)
+        and html_results.get(uploaded_file.name, (None, None))[0] != get_upload_key(uploaded_file)
+    ]
+    if pending_html:
         try:
             with st.spinner("Processing HTML: Extracting meaningful text and removing tags..."):
                 processor = UnstructuredDataProcessor()
-                result = processor.process_html_file(file_path, output_dir=DATA_DIR)
-                
+                results = processor.process_html_files(
+                    [DATA_DIR / uploaded_file.name for uploaded_file in pending_html],
+                    output_dir=DATA_DIR
+                )
+            for uploaded_file, result in zip(pending_html, results):
+                html_results[uploaded_file.name] = (get_upload_key(uploaded_file), result)
+        except Exception as e:
+            st.error(f"Error processing HTML: {e}")
+            import traceback
+            st.code(traceback.format_exc())
+    
+    for uploaded_file in uploaded_files:
+        file_path = DATA_DIR / uploaded_file.name
+        st.success(f"Uploaded: {uploaded_file.name}")
+    
+        # Check if uploaded file is HTML
+        processed_html_path = None
+        upload_key, result = html_results.get(uploaded_file.name, (None, None))
+    
+        if is_html_filename(uploaded_file.name) and upload_key == get_upload_key(uploaded_file):
+            try:
                 if result["success"]:
                     processed_html_path = Path(result["file_path"])
                     content_length = result.get('content_length', 0)
                     paragraphs = result.get('paragraphs', 0)
-                    
+            
                     if content_length == 0 or paragraphs == 0:
                         st.warning(f"HTML processed but extracted minimal content: {content_length} characters, {paragraphs} paragraphs")
                         st.info("The HTML file may contain mostly scripts, styles, or empty content. Check the preview below.")
                     else:
                         st.success(f"HTML processed successfully!")
                         st.info(f"Extracted {content_length} characters, {paragraphs} paragraphs")
-                    
+            
                     st.info(f"Processed text saved as: `{result['filename']}`")
-                    
+            
                     # Show preview of processed content
                     with st.expander("Preview Processed Content"):
                         if processed_html_path.exists():
@@ -572,25 +998,23 @@ if uploaded_file:
                     error_msg = result.get('error', 'Unknown error')
                     st.error(f"HTML processing failed: {error_msg}")
                     st.info("Tip: Make sure your HTML file contains readable text content, not just scripts or styles.")
-        except Exception as e:
-            st.error(f"Error processing HTML: {e}")
-            import traceback
-            st.code(traceback.format_exc())
+            except Exception as e:
+                st.error(f"Error processing HTML: {e}")
+                import traceback
+                st.code(traceback.format_exc())
 
-    # Determine which file to use for indexing
-    file_to_index = processed_html_path if processed_html_path else file_path
+        # Determine which file to use for indexing
+        if processed_html_path:
+            files_to_index.append((str(processed_html_path), None))
+        elif uploaded_file.size < MAX_IN_MEMORY_INGEST_BYTES:
+            # Ingest small uploads from memory instead of reading the saved copy back
+            files_to_index.append((str(file_path), uploaded_file.getvalue()))
+        else:
+            files_to_index.append((str(file_path), None))
     
-    if st.button("Process & Index Document"):
+    if st.button("Process & Index Documents" if len(files_to_index) > 1 else "Process & Index Document"):
         try:
-            with st.spinner("Processing document..."):
-                doc_info = process_and_index_document(str(file_to_index))
-            st.success(f"Document successfully indexed in Vector+Graph DB!")
-            st.json(doc_info["metadata"])
-            st.info(f"Indexed: {len(doc_info['paragraphs'])} paragraphs, {len(doc_info.get('entities', []))} entities, {len(doc_info.get('relationships', []))} relationships")
-            
-            # Show where data is stored (dynamic based on vector DB type)
-            _, storage_info, _ = get_vector_db_info()
-            st.info(f"Data stored in: {storage_info}")
+            index_documents(files_to_index, "Processing documents..." if len(files_to_index) > 1 else "Processing document...")
         except Exception as e:
             st.error(f"Error: {e}")
             import traceback
@@ -708,15 +1132,7 @@ if st.session_state.file_uploaded:
                         # Auto-process option
                         if st.button("Auto-Process & Index This File"):
                             try:
-                                with st.spinner("Processing and indexing document..."):
-                                    doc_info = process_and_index_document(result["file_path"])
-                                st.success(f"Document successfully indexed in Vector+Graph DB!")
-                                st.json(doc_info["metadata"])
-                                st.info(f"Indexed: {len(doc_info['paragraphs'])} paragraphs, {len(doc_info.get('entities', []))} entities, {len(doc_info.get('relationships', []))} relationships")
-                                
-                                # Show where data is stored (dynamic based on vector DB type)
-                                _, storage_info, _ = get_vector_db_info()
-                                st.info(f"Data stored in: {storage_info}")
+                                index_documents([(result["file_path"], None)], "Processing and indexing document...")
                             except Exception as e:
                                 st.error(f"Error during indexing: {e}")
                                 import traceback
@@ -740,7 +1156,7 @@ if st.session_state.file_uploaded:
         if not query.strip():
             st.warning("Please enter some text before searching!")
         else:
-            # Reload vector DB to get latest updates
+            # Pick up writes from other processes (only re-reads files that changed)
             retriever.vector_db.reload()
             
             with st.spinner("Running hybrid retrieval..."):
@@ -766,40 +1182,36 @@ if st.session_state.file_uploaded:
                     st.info("Please restart Streamlit to reload the updated module.")
                     st.stop()
                 
-                # Create temporary file for the graph image
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.png', dir=DATA_DIR) as tmp_file:
-                    temp_path = tmp_file.name
+                # Render the graph image in memory (no temp file round trip)
+                image_buffer = io.BytesIO()
                 
                 # Generate visualization
                 with st.spinner("Generating graph visualization..."):
                     fig = graph_loader.visualize_hybrid_search_results(
                         search_results=results,
                         query_text=query,
-                        output_path=temp_path,
+                        output_path=image_buffer,
                         figsize=(14, 10),
                         node_size=1500,
                         font_size=9
                     )
                 
                 if fig is not None:
+                    # The PNG bytes are in the buffer; free the figure
+                    import matplotlib.pyplot as plt
+                    plt.close(fig)
+                    image_bytes = image_buffer.getvalue()
+                    
                     # Display the graph
-                    st.image(temp_path, caption=f"Graph visualization for query: '{query}'", use_container_width=True)
+                    st.image(image_bytes, caption=f"Graph visualization for query: '{query}'", use_container_width=True)
                     
                     # Provide download button
-                    with open(temp_path, "rb") as img_file:
-                        st.download_button(
-                            label="Download Graph Visualization",
-                            data=img_file.read(),
-                            file_name=f"graph_{query.replace(' ', '_')[:50]}.png",
-                            mime="image/png"
-                        )
-                    
-                    # Clean up temp file after a delay (Streamlit will handle this)
-                    try:
-                        # Schedule cleanup (Streamlit will handle file cleanup)
-                        pass
-                    except:
-                        pass
+                    st.download_button(
+                        label="Download Graph Visualization",
+                        data=image_bytes,
+                        file_name=f"graph_{query.replace(' ', '_')[:50]}.png",
+                        mime="image/png"
+                    )
                 else:
                     st.info("Graph visualization is empty. This might be because:")
                     st.info("   - No graph relationships found in search results")
@@ -817,6 +1229,7 @@ if st.session_state.file_uploaded:
             st.divider()
             
             # Display individual results
+            doc_file_stats = {}  # filename -> os.stat_result (None if missing), one stat per file
             for idx, res in enumerate(results, start=1):
                 doc = res["vector_result"]
 
@@ -827,6 +1240,7 @@ if st.session_state.file_uploaded:
                 
                 # Get the full text (not truncated)
                 full_text = doc.get("text", "")
+                full_text_stats = text_stats(full_text)  # computed once per result, reused below
                 paragraph_id = doc.get("paragraph_id", "")
 
                 # Get scores with proper defaults
@@ -843,8 +1257,8 @@ if st.session_state.file_uploaded:
                 st.markdown(f"""
                 ### Result {idx}
                 **Filename:** `{filename}`  
-                **Vector Score:** `{round(vector_score, 6)}` | **Graph Score:** `{round(graph_score, 6)}{hop_info}` | **Final Score:** `{round(final_score, 6)}`  
-                **Formula:** `{v_weight:.2f} × {round(vector_score, 6)} + {g_weight:.2f} × {round(graph_score, 6)} = {round(final_score, 6)}`
+                **Vector Score:** `{vector_score:.6f}` | **Graph Score:** `{graph_score:.6f}{hop_info}` | **Final Score:** `{final_score:.6f}`  
+                **Formula:** `{v_weight:.2f} × {vector_score:.6f} + {g_weight:.2f} × {graph_score:.6f} = {final_score:.6f}`
                 """)
                 
                 # Show full text in a clean, readable format
@@ -852,232 +1266,80 @@ if st.session_state.file_uploaded:
                 # Display full text - ensure we show the complete paragraph without truncation
                 if full_text:
                     # Check if text is very short (might be a heading)
-                    is_short = len(full_text.strip()) < 90
+                    # (strip - which copies the text - only if it has whitespace at an end)
+                    is_short = len(full_text) < 90 or (
+                        (full_text[0].isspace() or full_text[-1].isspace()) and len(full_text.strip()) < 90
+                    )
                     if is_short:
                         st.info("This appears to be a short heading or section title from the document.")
                     
-                    # Calculate height based on content length (original sizing maintained)
-                    # Use approximately 20 pixels per line, with a minimum of 200px
-                    estimated_lines = max(len(full_text) // 80, 10)  # Rough estimate: 80 chars per line
-                    text_height = max(200, estimated_lines * 20)
-                    # Keep original max height (800px) but allow scrolling for very long content
-                    text_height = min(text_height, 800)  # Max 800px, but content will scroll if longer
-                    
-                    st.text_area(
-                        "Retrieved Content Text", 
-                        full_text, 
-                        height=text_height, 
-                        key=f"result_text_{idx}", 
-                        disabled=True, 
-                        label_visibility="collapsed",
-                        help=f"Full paragraph content ({len(full_text)} characters, {len(full_text.split())} words)"
+                    # Max 800px, content scrolls if longer
+                    show_scrollbox(
+                        full_text,
+                        max_height=800,
+                        tooltip=f"Full paragraph content ({full_text_stats.chars} characters, {full_text_stats.words} words)"
                     )
                     
                     # Show detailed content statistics with better formatting
-                    word_count = len(full_text.split())
-                    char_count = len(full_text)
-                    sentence_count = len([s for s in full_text.split('.') if s.strip()])
-                    st.caption(f"**Statistics:** {char_count:,} characters | {word_count:,} words | {sentence_count} sentences")
+                    st.caption(f"**Statistics:** {full_text_stats.chars:,} characters | {full_text_stats.words:,} words | {full_text_stats.sentences} sentences")
                 else:
                     st.warning("No content retrieved for this result.")
 
                 # Add expander to view the specific paragraph from the document
                 doc_file_path = DATA_DIR / filename
-                if doc_file_path.exists():
+                if filename not in doc_file_stats:
+                    doc_file_stats[filename] = stat_or_none(doc_file_path)
+                doc_file_stat = doc_file_stats[filename]
+                if "prev_text" in metadata and "next_text" in metadata:
                     with st.expander(f"View Source Paragraph from Document: {filename}", expanded=False):
-                        try:
-                            # Read document content
-                            pipeline = IngestionPipeline()
-                            doc_content = pipeline.run(str(doc_file_path))
-                            
-                            # Find the specific paragraph that was retrieved
-                            paragraphs = doc_content.get("paragraphs", [])
-                            retrieved_paragraph = None
-                            
-                            # Try to find the paragraph by paragraph_id
-                            if paragraph_id:
-                                for para in paragraphs:
-                                    if para.get("id") == paragraph_id:
-                                        retrieved_paragraph = para
-                                        break
-                            
-                            # If not found by ID, try to find by matching text
-                            if not retrieved_paragraph:
-                                for para in paragraphs:
-                                    para_text = para.get("text", "").strip()
-                                    if para_text and para_text == full_text.strip():
-                                        retrieved_paragraph = para
-                                        break
-                            
-                            # Display the retrieved paragraph with surrounding context
-                            if retrieved_paragraph:
-                                para_text = retrieved_paragraph.get("text", "")
-                                para_index = None
-                                
-                                # Find the index of the retrieved paragraph to get surrounding context
-                                for i, para in enumerate(paragraphs):
-                                    if para.get("id") == retrieved_paragraph.get("id"):
-                                        para_index = i
-                                        break
-                                
-                                # Build extended context with previous and next paragraphs
-                                context_paragraphs = []
-                                if para_index is not None:
-                                    # Include previous paragraph if available
-                                    if para_index > 0:
-                                        prev_para = paragraphs[para_index - 1]
-                                        context_paragraphs.append(("Previous Paragraph", prev_para.get("text", "")))
-                                    
-                                    # Current paragraph
-                                    context_paragraphs.append(("Current Paragraph (Retrieved)", para_text))
-                                    
-                                    # Include next paragraph if available
-                                    if para_index < len(paragraphs) - 1:
-                                        next_para = paragraphs[para_index + 1]
-                                        context_paragraphs.append(("Next Paragraph", next_para.get("text", "")))
-                                else:
-                                    context_paragraphs.append(("Retrieved Paragraph", para_text))
-                                
-                                # Display with context
-                                st.subheader(f"Paragraph {retrieved_paragraph.get('id', 'N/A')} with Surrounding Context")
-                                st.info("Showing the retrieved paragraph along with its surrounding context for better understanding.")
-                                
-                                # Show each paragraph in the context
-                                for context_label, context_text in context_paragraphs:
-                                    st.markdown(f"**{context_label}:**")
-                                    # Calculate height for each paragraph (original sizing)
-                                    para_lines = max(len(context_text) // 80, 10)
-                                    para_height = max(200, min(para_lines * 20, 600))  # Keep reasonable max height
-                                    
-                                    st.text_area(
-                                        context_label, 
-                                        context_text, 
-                                        height=para_height, 
-                                        key=f"para_context_{idx}_{context_label}", 
-                                        disabled=True, 
-                                        label_visibility="collapsed",
-                                        help=f"{context_label} ({len(context_text)} characters, {len(context_text.split())} words)"
-                                    )
-                                
-                                # Show comprehensive statistics
-                                total_chars = sum(len(t) for _, t in context_paragraphs)
-                                total_words = sum(len(t.split()) for _, t in context_paragraphs)
-                                total_sentences = sum(len([s for s in t.split('.') if s.strip()]) for _, t in context_paragraphs)
-                                st.caption(f"**Total Context Statistics:** {total_chars:,} characters | {total_words:,} words | {total_sentences} sentences | {len(context_paragraphs)} paragraphs")
-                            else:
-                                # Fallback: show the full text we retrieved with context
-                                st.subheader("Retrieved Content (Full Text)")
-                                
-                                # Try to find similar paragraphs for context
-                                similar_paragraphs = []
-                                for para in paragraphs:
-                                    para_text = para.get("text", "").strip()
-                                    # If paragraph text contains significant overlap with retrieved text
-                                    if para_text and len(para_text) > 50:
-                                        # Check for overlap (simple substring check)
-                                        if full_text[:100] in para_text or para_text[:100] in full_text:
-                                            similar_paragraphs.append(para)
-                                            if len(similar_paragraphs) >= 3:  # Limit to 3 similar paragraphs
-                                                break
-                                
-                                # Display retrieved text with similar paragraphs if found
-                                if similar_paragraphs:
-                                    st.info(f"Found {len(similar_paragraphs)} related paragraphs from the document for context:")
-                                    for sim_para in similar_paragraphs:
-                                        sim_text = sim_para.get("text", "")
-                                        st.markdown(f"**Related Paragraph {sim_para.get('id', 'N/A')}:**")
-                                        sim_lines = max(len(sim_text) // 80, 10)
-                                        sim_height = max(200, min(sim_lines * 20, 600))  # Original sizing
-                                        st.text_area(
-                                            f"Related Para {sim_para.get('id')}", 
-                                            sim_text, 
-                                            height=sim_height, 
-                                            key=f"related_para_{idx}_{sim_para.get('id')}", 
-                                            disabled=True, 
-                                            label_visibility="collapsed"
-                                        )
-                                else:
-                                    # Use original height calculation
-                                    fallback_lines = max(len(full_text) // 80, 10)
-                                    fallback_height = max(200, min(fallback_lines * 20, 800))  # Original max height
-                                    
-                                    st.text_area(
-                                        "Retrieved Content Text", 
-                                        full_text, 
-                                        height=fallback_height, 
-                                        key=f"fallback_para_{idx}", 
-                                        disabled=True, 
-                                        label_visibility="collapsed",
-                                        help=f"Complete retrieved content ({len(full_text)} characters, {len(full_text.split())} words)"
-                                    )
-                                
-                                # Show comprehensive statistics
-                                word_count = len(full_text.split())
-                                sentence_count = len([s for s in full_text.split('.') if s.strip()])
-                                st.caption(f"**Statistics:** {len(full_text):,} characters | {word_count:,} words | {sentence_count} sentences")
-                                st.info("Note: Could not locate exact paragraph in document. Showing retrieved content.")
-                            
-                            # Show document metadata
-                            with st.expander("Document Metadata"):
-                                st.json(doc_content.get("metadata", {}))
-                        except Exception as e:
-                            st.error(f"Error reading document: {e}")
-                            # Fallback: try to read as plain text
-                            try:
-                                if doc_file_path.suffix.lower() == ".txt":
-                                    with open(doc_file_path, "r", encoding="utf-8", errors="ignore") as f:
-                                        content = f.read()
-                                    # Try to find the paragraph in the content
-                                    if full_text.strip() in content:
-                                        # Find the paragraph context
-                                        idx_pos = content.find(full_text.strip())
-                                        if idx_pos != -1:
-                                            # Show some context around the paragraph
-                                            start = max(0, idx_pos - 100)
-                                            end = min(len(content), idx_pos + len(full_text) + 100)
-                                            context = content[start:end]
-                                            st.text_area("Document Context", context, height=300, key=f"doc_content_{idx}_fallback", disabled=True, label_visibility="collapsed")
-                                    else:
-                                        st.text_area("Document Content", full_text, height=300, key=f"doc_content_{idx}_fallback2", disabled=True, label_visibility="collapsed")
-                            except:
-                                st.warning("Could not display document content.")
+                        show_stored_paragraph_context(paragraph_id, full_text, metadata)
+                elif doc_file_stat is not None:
+                    # Indexed before neighbor paragraphs were stored - parse the document
+                    with st.expander(f"View Source Paragraph from Document: {filename}", expanded=False):
+                        # Rendered as a fragment, so loading the context reruns only this expander
+                        if hasattr(st, "fragment"):
+                            st.fragment(show_source_paragraph)(idx, filename, doc_file_path, doc_file_stat, paragraph_id, full_text, full_text_stats)
+                        else:
+                            show_source_paragraph(idx, filename, doc_file_path, doc_file_stat, paragraph_id, full_text, full_text_stats, on_demand=False)
                 else:
                     st.info(f"Document file not found: {filename}")
 
                 if res["graph_score"] > 0:
                     with st.expander("Graph Relationships"):
-                        for g in res["graph_relations"]:
-                            st.write(f"{g.get('source_id', 'N/A')} -[{g.get('rel_type', 'N/A')}]-> {g.get('related_id', 'N/A')}")
+                        # One element for all edges (one line each), not one st.write per edge
+                        st.markdown("  \n".join(
+                            f"{g.get('source_id', 'N/A')} -[{g.get('rel_type', 'N/A')}]-> {g.get('related_id', 'N/A')}"
+                            for g in res["graph_relations"]
+                        ))
     
     # Weight configuration sliders at the end (last options)
     st.divider()
     st.markdown("### Weight Configuration")
     col1, col2 = st.columns(2)
     with col1:
-        st.session_state.vector_weight = st.slider(
+        st.slider(
             "Vector Weight", 
             min_value=0.0, 
             max_value=1.0, 
             value=st.session_state.vector_weight, 
             step=0.1,
             help="Weight for vector similarity score (0.0 = ignore vector, 1.0 = vector only)",
-            key="vector_weight_slider"
+            key="vector_weight_slider",
+            on_change=normalize_weights
         )
     with col2:
-        st.session_state.graph_weight = st.slider(
+        st.slider(
             "Graph Weight", 
             min_value=0.0, 
             max_value=1.0, 
             value=st.session_state.graph_weight, 
             step=0.1,
             help="Weight for graph proximity score (0.0 = ignore graph, 1.0 = graph only)",
-            key="graph_weight_slider"
+            key="graph_weight_slider",
+            on_change=normalize_weights
         )
 
-    # Auto-normalize weights if they don't sum to 1.0
-    if abs(st.session_state.vector_weight + st.session_state.graph_weight - 1.0) > 0.01:
-        total = st.session_state.vector_weight + st.session_state.graph_weight
-        if total > 0:
-            st.session_state.vector_weight = st.session_state.vector_weight / total
-            st.session_state.graph_weight = st.session_state.graph_weight / total
+    # Weights are auto-normalized (by normalize_weights) if the sliders don't sum to 1.0
+    if abs(st.session_state.vector_weight_slider + st.session_state.graph_weight_slider - 1.0) > 0.01:
+        if st.session_state.vector_weight_slider + st.session_state.graph_weight_slider > 0:
             st.info(f"Weights normalized to: Vector={st.session_state.vector_weight:.2f}, Graph={st.session_state.graph_weight:.2f}")
\ No newline at end of file
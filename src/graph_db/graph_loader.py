@@ -13,17 +13,20 @@ Assumptions about JSON schema (matches ingestion output):
 }
 
 Behavior:
-- Create Paragraph nodes: (:Paragraph { id, text, source })
+- Create Paragraph nodes: (:Paragraph { id, text, source })  (id is "<source>:<paragraph id>")
 - Create Entity nodes: (:Entity:PERSON { id, text, source })  (label value becomes node label too)
-- Create Table nodes: (:Table { id, rows_count, source })
+- Create Table nodes: (:Table { id, rows_count, source })  (id is "<source>:<table id>")
 - Create relations:
     (Paragraph)-[:HAS_ENTITY]->(Entity)
     (Paragraph)-[:HAS_TABLE]->(Table)
     (Entity)-[:MENTIONED_IN]->(Paragraph)  (also created; duplicates are MERGE'd)
 - All node properties include `source_file` to trace origin.
+- Paragraph/table ids from ingestion (p1, p2, ...) repeat in every document, so they are
+  namespaced with the source; entity ids are shared across documents, and the document
+  an entity link came from is kept as `source_file` on the relationship.
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union, BinaryIO
 from pathlib import Path
 import json
 
@@ -75,25 +78,31 @@ class GraphLoader:
         entities: List[Dict[str, Any]] = doc.get("entities", [])
         tables: List[Dict[str, Any]] = doc.get("tables", [])
 
-        created_nodes = 0
-        created_rels = 0
+        # Nodes and relationships are collected first and written with one bulk
+        # (UNWIND) query per label / relationship type instead of one query each
+        nodes: List[Dict[str, Any]] = []
+        relationships: List[Dict[str, Any]] = []
 
         # Create paragraph nodes
+        paragraph_node_ids: Dict[str, str] = {}  # paragraph id in doc -> node id
         for p in paragraphs:
             pid = p.get("id") or self._make_id("paragraph")
+            node_id = self._scoped_id(source, pid)
+            paragraph_node_ids[pid] = node_id
             text = p.get("text", "")[:10000]  # trim if too long
             metadata = {"text": text, "source_file": source}
             # Paragraph label is 'Paragraph'
-            self.client.create_entity_node(entity_id=pid, label="Paragraph", metadata=metadata)
-            created_nodes += 1
+            nodes.append({"id": node_id, "label": "Paragraph", "metadata": metadata})
 
         # Create table nodes
+        table_node_ids: Dict[str, str] = {}  # table id in doc -> node id
         for t in tables:
             tid = t.get("id") or self._make_id("table")
+            node_id = self._scoped_id(source, tid)
+            table_node_ids[tid] = node_id
             rows = t.get("rows", [])
             metadata = {"rows_count": len(rows), "source_file": source}
-            self.client.create_entity_node(entity_id=tid, label="Table", metadata=metadata)
-            created_nodes += 1
+            nodes.append({"id": node_id, "label": "Table", "metadata": metadata})
 
         # Create entity nodes (use label from entity if available)
         for e in entities:
@@ -103,14 +112,16 @@ class GraphLoader:
             emeta = {"text": etext, "source_file": source}
             # Create node with label (e.g., PERSON, ORG) plus generic Entity label
             # We'll create with the provided label as the primary label
-            self.client.create_entity_node(entity_id=eid, label=elabel, metadata=emeta)
-            created_nodes += 1
+            nodes.append({"id": eid, "label": elabel, "metadata": emeta})
+
+        created_nodes = self.client.create_entity_nodes_bulk(nodes)
 
         # Create relationships:
         # Paragraph -> HAS_ENTITY (if entity mentions exist)
         # Paragraph -> HAS_TABLE (if table ids referenced)
         # If exact offsets or context exist in entity objects, we try to link them.
         entity_map = {e.get("id"): e for e in entities if e.get("id")}
+        link_meta = {"source_file": source}
         paragraph_map = {p.get("id"): p for p in paragraphs if p.get("id")}
         table_map = {t.get("id"): t for t in tables if t.get("id")}
 
@@ -121,24 +132,15 @@ class GraphLoader:
             ctx_pid = e.get("context_paragraph_id") or e.get("paragraph_id")
             if ctx_pid and ctx_pid in paragraph_map:
                 # Create relation Paragraph HAS_ENTITY -> Entity
-                try:
-                    self.client.create_relationship(start_entity_id=ctx_pid, end_entity_id=eid, rel_type="HAS_ENTITY")
-                    created_rels += 1
-                except Exception:
-                    # best-effort: ignore failing links
-                    pass
+                relationships.append({"start_id": paragraph_node_ids[ctx_pid], "end_id": eid, "rel_type": "HAS_ENTITY", "metadata": link_meta})
             else:
                 # If no explicit paragraph link, try to find paragraph containing the entity text (simple substring search)
                 ent_text = (e.get("text") or "").strip()
                 if ent_text:
                     for pid, p in paragraph_map.items():
                         if ent_text in (p.get("text") or ""):
-                            try:
-                                self.client.create_relationship(start_entity_id=pid, end_entity_id=eid, rel_type="HAS_ENTITY")
-                                created_rels += 1
-                                break
-                            except Exception:
-                                continue
+                            relationships.append({"start_id": paragraph_node_ids[pid], "end_id": eid, "rel_type": "HAS_ENTITY", "metadata": link_meta})
+                            break
 
         # Link paragraphs to tables if table ids are present in paragraph (best-effort)
         for pid, p in paragraph_map.items():
@@ -146,11 +148,7 @@ class GraphLoader:
             for tid in table_map.keys():
                 # naive check: table id appears in paragraph text
                 if tid in p_text:
-                    try:
-                        self.client.create_relationship(start_entity_id=pid, end_entity_id=tid, rel_type="HAS_TABLE")
-                        created_rels += 1
-                    except Exception:
-                        continue
+                    relationships.append({"start_id": paragraph_node_ids[pid], "end_id": table_node_ids[tid], "rel_type": "HAS_TABLE"})
 
         # Also create reciprocal mention links: Entity -> MENTIONED_IN -> Paragraph
         # (create both directions optional)
@@ -158,14 +156,17 @@ class GraphLoader:
             eid = e.get("id")
             for pid, p in paragraph_map.items():
                 if e.get("text") and e.get("text") in (p.get("text") or ""):
-                    try:
-                        self.client.create_relationship(start_entity_id=eid, end_entity_id=pid, rel_type="MENTIONED_IN")
-                        created_rels += 1
-                    except Exception:
-                        continue
+                    relationships.append({"start_id": eid, "end_id": paragraph_node_ids[pid], "rel_type": "MENTIONED_IN", "metadata": link_meta})
+
+        # best-effort: failing links are skipped and not counted
+        created_rels = self.client.create_relationships_bulk(relationships, skip_errors=True)
 
         return {"nodes_created": created_nodes, "relationships_created": created_rels}
 
+    def _scoped_id(self, source: str, local_id: str) -> str:
+        """Node id of a paragraph/table, unique across documents."""
+        return f"{source}:{local_id}"
+
     def _make_id(self, prefix: str) -> str:
         import uuid
         return f"{prefix}_{uuid.uuid4().hex[:8]}"
@@ -212,7 +213,7 @@ class GraphLoader:
         self,
         search_results: List[Dict[str, Any]],
         query_text: Optional[str] = None,
-        output_path: Optional[str] = None,
+        output_path: Optional[Union[str, BinaryIO]] = None,
         figsize: Tuple[int, int] = (12, 8),
         node_size: int = 1000,
         font_size: int = 8
@@ -226,7 +227,8 @@ class GraphLoader:
         Args:
             search_results: List of hybrid search result dictionaries from HybridRetriever
             query_text: Optional query text to display in the title
-            output_path: Optional path to save the visualization image
+            output_path: Optional path (or binary file-like object, e.g. io.BytesIO)
+                to save the visualization image as PNG
             figsize: Figure size (width, height) in inches
             node_size: Size of nodes in the visualization
             font_size: Font size for node labels
@@ -514,7 +516,7 @@ class GraphLoader:
         plt.tight_layout()
         
         # Save if output path provided
-        if output_path:
-            plt.savefig(output_path, dpi=150, bbox_inches="tight")
+        if output_path is not None:
+            fig.savefig(output_path, format="png", dpi=150, bbox_inches="tight")
         
         return fig
@@ -3,13 +3,24 @@ Memgraph Graph DB client using gqlalchemy (works on Windows + Python 3.13)
 Supports:
 - Creating nodes for entities
 - Creating relationships between nodes
+- Bulk creation of nodes/relationships (one UNWIND query per label/type)
 - Storing metadata as node/edge properties
 """
 
 from typing import Dict, List, Optional, Any
 from gqlalchemy import Memgraph
 from gqlalchemy.exceptions import GQLAlchemyWaitForConnectionError
-import json
+import re
+
+# Labels and relationship types can't be query parameters, so they are
+# interpolated into the Cypher text - only plain identifiers are allowed
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _check_identifier(value: str, kind: str) -> str:
+    if not isinstance(value, str) or not _IDENTIFIER_RE.match(value):
+        raise ValueError(f"Invalid {kind}: {value!r}")
+    return value
 
 
 class MemgraphClient:
@@ -46,23 +57,11 @@ class MemgraphClient:
             label: Label/type of entity (e.g., Person, Company)
             metadata: Dictionary of additional properties
         """
+        _check_identifier(label, "node label")
         try:
-            # Build properties string with proper escaping
-            props_list = [f"id: '{entity_id}'"]
-            for k, v in metadata.items():
-                # Escape single quotes in string values
-                if isinstance(v, str):
-                    escaped_value = v.replace("'", "\\'")
-                    props_list.append(f"{k}: '{escaped_value}'")
-                else:
-                    # For non-string values, use JSON representation
-                    props_list.append(f"{k}: {json.dumps(v)}")
-            
-            props_str = ", ".join(props_list)
-            query = f"""
-            MERGE (n:{label} {{{props_str}}})
-            """
-            self.memgraph.execute(query)
+            # Parameterized so values need no escaping and Memgraph can reuse the query plan
+            query = f"MERGE (n:{label} {{id: $id}}) SET n += $props"
+            self.memgraph.execute(query, parameters={"id": entity_id, "props": metadata or {}})
         except (GQLAlchemyWaitForConnectionError, Exception) as e:
             raise ConnectionError(
                 f"Failed to execute query. Make sure Memgraph is running. Error: {e}"
@@ -85,37 +84,125 @@ class MemgraphClient:
             rel_type: Relationship type (string)
             metadata: Optional dict for relationship properties
         """
+        _check_identifier(rel_type, "relationship type")
         try:
-            props_str = ""
-            if metadata:
-                props_list = []
-                for k, v in metadata.items():
-                    # Escape single quotes in string values
-                    if isinstance(v, str):
-                        escaped_value = v.replace("'", "\\'")
-                        props_list.append(f"{k}: '{escaped_value}'")
-                    else:
-                        # For non-string values, use JSON representation
-                        props_list.append(f"{k}: {json.dumps(v)}")
-                props_str = "{" + ", ".join(props_list) + "}"
-
-            query = f"""
-            MATCH (a {{id: '{start_entity_id}'}}), (b {{id: '{end_entity_id}'}})
-            MERGE (a)-[r:{rel_type} {props_str}]->(b)
-            """
-            self.memgraph.execute(query)
+            # Parameterized so values need no escaping and Memgraph can reuse the query plan
+            query = (
+                f"MATCH (a {{id: $start_id}}), (b {{id: $end_id}}) "
+                f"MERGE (a)-[r:{rel_type}]->(b) SET r += $props"
+            )
+            self.memgraph.execute(
+                query,
+                parameters={"start_id": start_entity_id, "end_id": end_entity_id, "props": metadata or {}}
+            )
         except (GQLAlchemyWaitForConnectionError, Exception) as e:
             raise ConnectionError(
                 f"Failed to execute query. Make sure Memgraph is running. Error: {e}"
             )
 
+    # -------------------- BULK OPERATIONS --------------------
+    def _execute_rows(self, query: str, rows: List[Dict[str, Any]], chunk_size: int, skip_errors: bool = False) -> int:
+        """
+        Run an UNWIND $rows query once per chunk_size rows and return the number of
+        rows written. With skip_errors a failing chunk is retried one row at a time,
+        so only the rows that fail on their own are skipped instead of raising.
+        """
+        written = 0
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                self.memgraph.execute(query, parameters={"rows": chunk})
+                written += len(chunk)
+            except (GQLAlchemyWaitForConnectionError, Exception) as e:
+                if not skip_errors:
+                    raise ConnectionError(
+                        f"Failed to execute query. Make sure Memgraph is running. Error: {e}"
+                    )
+                for row in chunk:
+                    try:
+                        self.memgraph.execute(query, parameters={"rows": [row]})
+                        written += 1
+                    except (GQLAlchemyWaitForConnectionError, Exception):
+                        continue
+        return written
+
+    def create_entity_nodes_bulk(self, entities: List[Dict[str, Any]], chunk_size: int = 1000) -> int:
+        """
+        Create many nodes with one UNWIND query per label (and per chunk_size nodes)
+        instead of one round trip per node.
+
+        Args:
+            entities: Dicts with "id", "label" and optional "metadata" (see create_entity_node)
+            chunk_size: Maximum number of nodes sent per query
+
+        Returns:
+            Number of nodes written
+        """
+        # The label is part of the query text, so each label gets its own query
+        rows_by_label: Dict[str, List[Dict[str, Any]]] = {}
+        for entity in entities:
+            label = _check_identifier(entity["label"], "node label")
+            rows_by_label.setdefault(label, []).append(
+                {"id": entity["id"], "props": entity.get("metadata") or {}}
+            )
+
+        written = 0
+        for label, rows in rows_by_label.items():
+            query = f"UNWIND $rows AS row MERGE (n:{label} {{id: row.id}}) SET n += row.props"
+            written += self._execute_rows(query, rows, chunk_size)
+        return written
+
+    def create_relationships_bulk(
+        self,
+        relationships: List[Dict[str, Any]],
+        chunk_size: int = 1000,
+        skip_errors: bool = False
+    ) -> int:
+        """
+        Create many relationships with one UNWIND query per type (and per chunk_size
+        relationships) instead of one round trip per relationship.
+
+        Args:
+            relationships: Dicts with "start_id", "end_id", "rel_type" and optional
+                "metadata" (see create_relationship)
+            chunk_size: Maximum number of relationships sent per query
+            skip_errors: If True, skip relationships with an invalid type and rows whose
+                query fails, instead of raising (best-effort linking)
+
+        Returns:
+            Number of relationships written
+        """
+        # The relationship type is part of the query text, so each type gets its own query
+        rows_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for rel in relationships:
+            try:
+                rel_type = _check_identifier(rel["rel_type"], "relationship type")
+            except ValueError:
+                if skip_errors:
+                    continue
+                raise
+            rows_by_type.setdefault(rel_type, []).append(
+                {"start_id": rel["start_id"], "end_id": rel["end_id"], "props": rel.get("metadata") or {}}
+            )
+
+        written = 0
+        for rel_type, rows in rows_by_type.items():
+            query = (
+                f"UNWIND $rows AS row "
+                f"MATCH (a {{id: row.start_id}}), (b {{id: row.end_id}}) "
+                f"MERGE (a)-[r:{rel_type}]->(b) SET r += row.props"
+            )
+            written += self._execute_rows(query, rows, chunk_size, skip_errors=skip_errors)
+        return written
+
     # -------------------- QUERY --------------------
-    def run_query(self, query: str) -> List[Dict[str, Any]]:
+    def run_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Execute arbitrary Cypher query and return results as list of dicts.
+        Values referenced as $name in the query are passed in parameters.
         """
         try:
-            result = self.memgraph.execute_and_fetch(query)
+            result = self.memgraph.execute_and_fetch(query, parameters=parameters or {})
             # Convert results to list of dicts
             # gqlalchemy returns Record objects that can be converted to dicts
             results = []
@@ -14,7 +14,7 @@ from typing import List, Dict, Any, Tuple, Optional
 from src.embedding.embedder import Embedder
 from src.vector_db import get_vector_db  # Factory function for configurable vector DB
 from src.graph_db.memgraph_client import MemgraphClient     # using gqlalchemy or other client
-from src.utils.config import EMBEDDING_MODEL_NAME
+from src.utils.config import EMBEDDING_MODEL_NAME, EMBEDDING_BATCH_SIZE, EMBEDDING_USE_ONNX_INT8
 
 class HybridRetriever:
     def __init__(
@@ -24,7 +24,11 @@ class HybridRetriever:
         vector_weight: float = 0.6,
         graph_weight: float = 0.4
     ):
-        self.embedder = Embedder(model_name=EMBEDDING_MODEL_NAME)
+        self.embedder = Embedder(
+            model_name=EMBEDDING_MODEL_NAME,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            use_onnx_int8=EMBEDDING_USE_ONNX_INT8
+        )
         self.vector_db = get_vector_db()  # Get configured vector DB (local or chromadb)
         
         # Try to connect to graph DB, but don't fail if it's not available
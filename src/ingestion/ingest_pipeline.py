@@ -12,13 +12,17 @@ Supported formats: txt, pdf, docx, csv
 Note: For spaCy NER, install spaCy and download a model:
     pip install spacy
     python -m spacy download en_core_web_sm
+    python -m spacy download en_core_web_trf  # optional, used with use_gpu=True
 """
 
+import io
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Tuple, Optional, Union
 from docling.document_converter import DocumentConverter
-from docling.datamodel.base_models import ConversionStatus
+from docling.datamodel.base_models import ConversionStatus, DocumentStream
 import hashlib
+import re
+from functools import lru_cache
 
 # Try to import spaCy for advanced NER
 try:
@@ -28,17 +32,89 @@ except ImportError:
     SPACY_AVAILABLE = False
     spacy = None
 
+# Map spaCy labels to our entity labels
+_SPACY_TO_LABEL = {
+    "PERSON": "Person",
+    "ORG": "Company",
+    "GPE": "Location",  # Geopolitical entity (countries, cities, etc.)
+    "LOC": "Location",  # Non-geopolitical locations
+    "MONEY": "Concept",
+    "DATE": "Concept",
+    "TIME": "Concept",
+    "PERCENT": "Concept",
+    "QUANTITY": "Concept",
+    "EVENT": "Concept",
+    "PRODUCT": "Concept",
+    "WORK_OF_ART": "Concept",
+    "LAW": "Concept",
+    "LANGUAGE": "Concept",
+    "NORP": "Concept",  # Nationalities or religious/political groups
+}
+
+# Paragraph breaks: a blank line, including lines holding only whitespace
+_PARA_SPLIT = re.compile(r"\n\s*\n")
+_WS = re.compile(r"\s+")
+
+# Keyword lists for the simple (non-spaCy) entity extractor (can be expanded)
+_PERSON_KEYWORDS = frozenset(["alice", "bob", "john", "mary", "david", "sarah", "engineer", "developer", "manager", "director", "ceo", "cto"])
+_COMPANY_KEYWORDS = ["company", "corporation", "inc", "ltd", "llc", "organization", "firm", "enterprise"]
+_LOCATION_KEYWORDS = ["bangalore", "mumbai", "delhi", "new york", "london", "san francisco", "city", "location"]
+_TECH_KEYWORDS = ["ai", "machine learning", "deep learning", "neural network", "algorithm", "database", "graph", "vector"]
+_NOT_NAME_WORDS = frozenset(["the", "this", "that", "there", "company", "corporation"])
+_COMPANY_KEYWORD_RE = re.compile("|".join(map(re.escape, _COMPANY_KEYWORDS)))
+# Zero-width lookahead so overlapping keywords are all found, like `keyword in text`
+# (no keyword is a prefix of another, so one match per position is enough)
+_SCAN_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, _LOCATION_KEYWORDS + _TECH_KEYWORDS)) + "))"
+)
+
+
+# Loaded spaCy pipelines are shared by every IngestionPipeline in the process, keyed by
+# model name, excluded components and device, so creating a pipeline per request does
+# not reload the model.
+@lru_cache(maxsize=4)
+def _load_spacy_model(model_name: str, exclude: Tuple[str, ...], on_gpu: bool):
+    """spacy.load() of model_name without the excluded components."""
+    return spacy.load(model_name, exclude=list(exclude))
+
+
+@lru_cache(maxsize=None)
+def _explain_spacy_label(label: str) -> Optional[str]:
+    """spacy.explain() of an entity label, looked up once per label."""
+    return spacy.explain(label) if SPACY_AVAILABLE and hasattr(spacy, 'explain') else label
+
 
 class IngestionPipeline:
     SUPPORTED_EXT = {".txt", ".pdf", ".docx", ".csv"}
 
-    def __init__(self, use_spacy: bool = True, spacy_model: str = "en_core_web_sm"):
+    def __init__(
+        self,
+        use_spacy: bool = True,
+        spacy_model: Optional[str] = None,
+        spacy_batch_size: Optional[int] = None,
+        spacy_n_process: int = 1,
+        spacy_exclude: Tuple[str, ...] = ("lemmatizer",),
+        extract_dep_relations: bool = True,
+        use_gpu: bool = False
+    ):
         """
         Initialize the Docling document converter and spaCy NER model.
         
         Args:
             use_spacy: If True, use spaCy for entity extraction (default: True)
-            spacy_model: spaCy model to use (default: "en_core_web_sm")
+            spacy_model: spaCy model to use (default: "en_core_web_sm", or "en_core_web_trf"
+                when running on the GPU)
+            spacy_batch_size: Paragraphs per spaCy nlp.pipe() batch (default: 64 on CPU,
+                256 on the GPU)
+            spacy_n_process: Worker processes for nlp.pipe() (default: 1, -1 = all CPUs)
+            spacy_exclude: spaCy pipeline components not to load (default: the lemmatizer,
+                which entity extraction doesn't use; the relationship patterns need the
+                parser, and the tagger + attribute_ruler for token.pos_)
+            extract_dep_relations: If True (default), run the full pipeline and add the
+                dependency-pattern relationships; if False, only tok2vec + ner run per
+                paragraph and relationships come from co-occurrence alone
+            use_gpu: If True, run spaCy on the GPU when one is available (spacy.prefer_gpu());
+                falls back to the CPU path otherwise (default: False)
         """
         # Use default pipeline options from the installed Docling version.
         # The constructor signature may change across versions, so we avoid
@@ -47,20 +123,37 @@ class IngestionPipeline:
         
         # Initialize spaCy NER model
         self.use_spacy = use_spacy and SPACY_AVAILABLE
+        # spacy.prefer_gpu() must run before spacy.load() so the model is allocated on the GPU
+        self.spacy_gpu = False
+        if self.use_spacy and use_gpu:
+            try:
+                self.spacy_gpu = spacy.prefer_gpu()
+            except Exception as e:
+                print(f"⚠️  Could not enable GPU for spaCy: {e}")
+            if not self.spacy_gpu:
+                print("⚠️  No GPU available for spaCy, using the CPU")
+        if spacy_model is None:
+            spacy_model = "en_core_web_trf" if self.spacy_gpu else "en_core_web_sm"
+        if spacy_batch_size is None:
+            spacy_batch_size = 256 if self.spacy_gpu else 64
         self.spacy_model_name = spacy_model
+        self.spacy_batch_size = spacy_batch_size
+        self.spacy_n_process = spacy_n_process
+        self.spacy_exclude = tuple(spacy_exclude)
+        self.extract_dep_relations = extract_dep_relations
         self.nlp = None
         
         if self.use_spacy:
             try:
                 # Try to load the specified model
-                self.nlp = spacy.load(spacy_model)
+                self.nlp = _load_spacy_model(spacy_model, self.spacy_exclude, self.spacy_gpu)
                 print(f"✅ Loaded spaCy model: {spacy_model}")
             except OSError:
                 # Model not found, try to download it or use a fallback
                 try:
                     # Try loading a smaller model or default
                     if spacy_model != "en_core_web_sm":
-                        self.nlp = spacy.load("en_core_web_sm")
+                        self.nlp = _load_spacy_model("en_core_web_sm", self.spacy_exclude, self.spacy_gpu)
                         print(f"⚠️  Model {spacy_model} not found, using en_core_web_sm")
                     else:
                         # Model needs to be downloaded
@@ -92,27 +185,63 @@ class IngestionPipeline:
             raw_text = path.read_text(encoding="utf-8", errors="ignore")
             tables = []
         else:
-            # Convert document using Docling for supported rich formats
-            result = self.converter.convert(str(path))
-            if result.status != ConversionStatus.SUCCESS:
-                raise RuntimeError(f"Docling conversion failed for {file_path}")
+            raw_text, tables = self._convert(str(path), file_path)
 
-            doc = result.document
+        return self._build_document(path.name, path.suffix, path.stat().st_size, raw_text, tables)
 
-            # Extract raw text - Docling uses export_to_text() method
-            try:
-                raw_text = doc.export_to_text() if hasattr(doc, "export_to_text") else ""
-            except Exception:
-                # Fallback: try to get text from body or other attributes
-                raw_text = getattr(doc, "text", "") or getattr(doc, "body", "") or ""
-                # If body is an object, try to convert it
-                if hasattr(raw_text, "export_to_text"):
-                    raw_text = raw_text.export_to_text()
-                elif not isinstance(raw_text, str):
-                    raw_text = str(raw_text) if raw_text else ""
-
-            # Extract tables if available
-            tables = getattr(doc, "tables", [])
+    def run_bytes(self, data: bytes, filename: str) -> Dict[str, Any]:
+        """
+        Process an in-memory document (e.g. an upload) and return structured JSON,
+        without writing it to disk and reading it back first.
+        """
+        name = Path(filename).name
+        ext = Path(name).suffix.lower()
+        if ext not in self.SUPPORTED_EXT:
+            raise ValueError(f"Unsupported file extension: {ext}")
+
+        if ext == ".txt":
+            # Same decoding (and newline translation) as Path.read_text
+            raw_text = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", errors="ignore").read()
+            tables = []
+        else:
+            raw_text, tables = self._convert(DocumentStream(name=name, stream=io.BytesIO(data)), name)
+
+        return self._build_document(name, Path(name).suffix, len(data), raw_text, tables)
+
+    # -------------------- Internal Methods --------------------
+    def _convert(self, source: Union[str, DocumentStream], label: str) -> Tuple[str, List[Any]]:
+        """
+        Convert a rich-format document (path or in-memory stream) with Docling.
+        Returns (raw text, tables).
+        """
+        # Convert document using Docling for supported rich formats
+        result = self.converter.convert(source)
+        if result.status != ConversionStatus.SUCCESS:
+            raise RuntimeError(f"Docling conversion failed for {label}")
+
+        doc = result.document
+
+        # Extract raw text - Docling uses export_to_text() method
+        try:
+            raw_text = doc.export_to_text() if hasattr(doc, "export_to_text") else ""
+        except Exception:
+            # Fallback: try to get text from body or other attributes
+            raw_text = getattr(doc, "text", "") or getattr(doc, "body", "") or ""
+            # If body is an object, try to convert it
+            if hasattr(raw_text, "export_to_text"):
+                raw_text = raw_text.export_to_text()
+            elif not isinstance(raw_text, str):
+                raw_text = str(raw_text) if raw_text else ""
+
+        # Extract tables if available
+        tables = getattr(doc, "tables", [])
+        return raw_text, tables
+
+    def _build_document(self, name: str, extension: str, filesize: int, raw_text: str, tables: List[Any]) -> Dict[str, Any]:
+        """
+        Build the structured JSON for a document from its extracted text and tables.
+        """
+        ext = extension.lower()
 
         # Split text into paragraphs
         paragraphs = self._split_into_paragraphs(raw_text)
@@ -125,13 +254,13 @@ class IngestionPipeline:
 
         # Metadata
         metadata = {
-            "filename": path.name,
-            "filesize": path.stat().st_size,
-            "extension": path.suffix
+            "filename": name,
+            "filesize": filesize,
+            "extension": extension
         }
 
         return {
-            "source": path.name,
+            "source": name,
             "type": ext.replace(".", ""),
             "metadata": metadata,
             "paragraphs": paragraphs,
@@ -140,35 +269,15 @@ class IngestionPipeline:
             "relationships": relationships,
         }
 
-    # -------------------- Internal Methods --------------------
     def _split_into_paragraphs(self, raw_text: str) -> List[Dict[str, Any]]:
         """
         Split text into paragraphs. Uses multiple strategies to ensure full text is captured:
-        1. Split by double newlines (\n\n) - standard paragraph breaks
-        2. If that yields very few paragraphs, also try single newlines
-        3. Merge very short fragments with previous paragraph to avoid truncation
+        1. Split on blank lines (two or more newlines, possibly with whitespace between)
+        2. Merge very short fragments with previous paragraph to avoid truncation
         """
         paragraphs = []
         
-        # First, try splitting by double newlines (standard paragraph breaks)
-        blocks = raw_text.split("\n\n")
-        
-        # If we get very few blocks and text is long, also try single newlines
-        if len(blocks) < 3 and len(raw_text) > 500:
-            # Try splitting by single newlines and then grouping
-            lines = raw_text.split("\n")
-            blocks = []
-            current_block = []
-            for line in lines:
-                line = line.strip()
-                if line:
-                    current_block.append(line)
-                else:
-                    if current_block:
-                        blocks.append(" ".join(current_block))
-                        current_block = []
-            if current_block:
-                blocks.append(" ".join(current_block))
+        blocks = _PARA_SPLIT.split(raw_text)
         
         # Process blocks and merge very short ones to avoid truncation
         idx = 0
@@ -184,7 +293,7 @@ class IngestionPipeline:
             else:
                 # Normalize whitespace but preserve full content
                 # Replace multiple spaces with single space, but keep newlines within paragraph
-                normalized = " ".join(block.split())
+                normalized = _WS.sub(" ", block)
                 if normalized:  # Only add if not empty after normalization
                     paragraphs.append({
                         "id": f"p{idx+1}",
@@ -194,7 +303,7 @@ class IngestionPipeline:
         
         # If we still have no paragraphs but have text, create one paragraph with all text
         if not paragraphs and raw_text.strip():
-            normalized = " ".join(raw_text.split())
+            normalized = _WS.sub(" ", raw_text).strip()
             if normalized:
                 paragraphs.append({
                     "id": "p1",
@@ -203,6 +312,23 @@ class IngestionPipeline:
         
         return paragraphs
 
+    def _pipe_paragraphs(self, texts: Iterable[str]) -> Iterator[Any]:
+        """
+        Run the paragraphs through nlp.pipe(). Without dependency relationships only
+        the embedding layer (tok2vec, or transformer for _trf models) + ner are needed,
+        so the other components (tagger, parser, ...) are disabled for this call. The
+        loaded model is shared between pipelines, so it is not modified in place.
+        """
+        disable = []
+        if not self.extract_dep_relations:
+            disable = [name for name in self.nlp.pipe_names if name not in ("tok2vec", "transformer", "ner")]
+        return self.nlp.pipe(
+            texts,
+            batch_size=self.spacy_batch_size,
+            n_process=self.spacy_n_process,
+            disable=disable
+        )
+
     def _extract_entities_spacy(self, paragraphs: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
         Extract entities using spaCy NER (Named Entity Recognition).
@@ -220,34 +346,13 @@ class IngestionPipeline:
         relationships = []
         entity_map = {}  # Maps entity_id -> entity dict
         entity_text_to_id = {}  # Maps normalized entity text -> entity_id
+        rel_keys = set()  # (start, end, type) of the relationships created so far
         
-        # Map spaCy labels to our entity labels
-        spacy_to_label = {
-            "PERSON": "Person",
-            "ORG": "Company",
-            "GPE": "Location",  # Geopolitical entity (countries, cities, etc.)
-            "LOC": "Location",  # Non-geopolitical locations
-            "MONEY": "Concept",
-            "DATE": "Concept",
-            "TIME": "Concept",
-            "PERCENT": "Concept",
-            "QUANTITY": "Concept",
-            "EVENT": "Concept",
-            "PRODUCT": "Concept",
-            "WORK_OF_ART": "Concept",
-            "LAW": "Concept",
-            "LANGUAGE": "Concept",
-            "NORP": "Concept",  # Nationalities or religious/political groups
-        }
-        
-        # Process each paragraph
-        for para in paragraphs:
-            para_text = para["text"]
+        # Process the paragraphs with spaCy in batches (nlp.pipe), then each paragraph's doc
+        docs = self._pipe_paragraphs(para["text"] for para in paragraphs)
+        for para, doc in zip(paragraphs, docs):
             para_entities = []
             
-            # Process paragraph with spaCy
-            doc = self.nlp(para_text)
-            
             # Extract named entities
             for ent in doc.ents:
                 # Skip very short entities (likely false positives)
@@ -255,18 +360,18 @@ class IngestionPipeline:
                     continue
                 
                 # Get our label mapping
-                entity_label = spacy_to_label.get(ent.label_, "Concept")
-                
-                # Create normalized entity ID from text
-                entity_text_normalized = ent.text.strip().lower().replace(" ", "_")
-                # Create unique ID using hash to handle duplicates
-                entity_id_base = f"e_{entity_text_normalized}"
-                entity_id = hashlib.md5(f"{entity_id_base}_{ent.label_}".encode()).hexdigest()[:12]
-                entity_id = f"e_{entity_id}"
+                entity_label = _SPACY_TO_LABEL.get(ent.label_, "Concept")
                 
                 # Check if we've seen this entity before (by text and label)
                 entity_key = (ent.text.strip().lower(), ent.label_)
                 if entity_key not in entity_text_to_id:
+                    # Create normalized entity ID from text (hashed once per distinct entity).
+                    # IDs are stable across documents, so graph nodes of the same entity merge
+                    entity_text_normalized = entity_key[0].replace(" ", "_")
+                    # Create unique ID using hash to handle duplicates
+                    entity_id_base = f"e_{entity_text_normalized}"
+                    entity_id = hashlib.md5(f"{entity_id_base}_{ent.label_}".encode()).hexdigest()[:12]
+                    entity_id = f"e_{entity_id}"
                     entity_text_to_id[entity_key] = entity_id
                     
                     # Create entity dict
@@ -276,7 +381,7 @@ class IngestionPipeline:
                         "metadata": {
                             "name": ent.text.strip(),
                             "spacy_label": ent.label_,
-                            "spacy_label_desc": spacy.explain(ent.label_) if SPACY_AVAILABLE and hasattr(spacy, 'explain') else ent.label_,
+                            "spacy_label_desc": _explain_spacy_label(ent.label_),
                             "start_char": ent.start_char,
                             "end_char": ent.end_char
                         }
@@ -287,80 +392,86 @@ class IngestionPipeline:
                 entity_id = entity_text_to_id[entity_key]
                 para_entities.append(entity_id)
             
-            # Extract relationships using dependency parsing
+            # Extract relationships using dependency parsing (skipped in NER-only mode)
             # Look for common relationship patterns
-            for token in doc:
-                # Pattern: PERSON works at ORG
-                if token.dep_ == "nsubj" and token.head.pos_ == "VERB":
-                    # Find the subject (person) and object (company/location)
-                    subject_ent = None
-                    object_ent = None
+            if self.extract_dep_relations and doc.ents:
+                # Entity span covering each token, so the patterns look it up in O(1)
+                ent_for_tok = [None] * len(doc)
+                for ent in doc.ents:
+                    for i in range(ent.start, ent.end):
+                        ent_for_tok[i] = ent
+                
+                for token in doc:
+                    # Pattern: PERSON works at ORG
+                    if token.dep_ == "nsubj" and token.head.pos_ == "VERB":
+                        # Find the subject (person) and object (company/location)
+                        subject_ent = None
+                        object_ent = None
                     
-                    # Find entity for subject
-                    for ent in doc.ents:
-                        if ent.start <= token.i < ent.end:
-                            if ent.label_ == "PERSON":
-                                subject_ent = ent
-                            break
+                        # Find entity for subject
+                        ent = ent_for_tok[token.i]
+                        if ent is not None and ent.label_ == "PERSON":
+                            subject_ent = ent
                     
-                    # Find entity for object (dobj or pobj)
-                    for child in token.head.children:
-                        if child.dep_ in ["dobj", "pobj", "prep"]:
-                            for ent in doc.ents:
-                                if ent.start <= child.i < ent.end:
-                                    if ent.label_ in ["ORG", "GPE", "LOC"]:
-                                        object_ent = ent
-                                    break
+                        # Find entity for object (dobj or pobj)
+                        for child in token.head.children:
+                            if child.dep_ in ["dobj", "pobj", "prep"]:
+                                ent = ent_for_tok[child.i]
+                                if ent is not None and ent.label_ in ["ORG", "GPE", "LOC"]:
+                                    object_ent = ent
                     
-                    # Create relationship if we found both
-                    if subject_ent and object_ent:
-                        subj_id = entity_text_to_id.get((subject_ent.text.strip().lower(), subject_ent.label_))
-                        obj_id = entity_text_to_id.get((object_ent.text.strip().lower(), object_ent.label_))
+                        # Create relationship if we found both
+                        if subject_ent and object_ent:
+                            subj_id = entity_text_to_id.get((subject_ent.text.strip().lower(), subject_ent.label_))
+                            obj_id = entity_text_to_id.get((object_ent.text.strip().lower(), object_ent.label_))
                         
-                        if subj_id and obj_id:
-                            # Determine relationship type based on verb
-                            verb_text = token.head.text.lower()
-                            rel_type = "RELATED_TO"
+                            if subj_id and obj_id:
+                                # Determine relationship type based on verb
+                                verb_text = token.head.text.lower()
+                                rel_type = "RELATED_TO"
                             
-                            if any(v in verb_text for v in ["work", "employed", "hired"]):
-                                rel_type = "WORKS_AT"
-                            elif any(v in verb_text for v in ["live", "located", "based"]):
-                                rel_type = "LOCATED_IN"
-                            elif any(v in verb_text for v in ["found", "create", "establish"]):
-                                rel_type = "FOUNDED"
-                            elif any(v in verb_text for v in ["own", "acquire", "purchase"]):
-                                rel_type = "OWNS"
+                                if any(v in verb_text for v in ["work", "employed", "hired"]):
+                                    rel_type = "WORKS_AT"
+                                elif any(v in verb_text for v in ["live", "located", "based"]):
+                                    rel_type = "LOCATED_IN"
+                                elif any(v in verb_text for v in ["found", "create", "establish"]):
+                                    rel_type = "FOUNDED"
+                                elif any(v in verb_text for v in ["own", "acquire", "purchase"]):
+                                    rel_type = "OWNS"
                             
-                            # Check if relationship already exists
-                            rel_key = (subj_id, obj_id, rel_type)
-                            if not any(r["start"] == subj_id and r["end"] == obj_id and r["type"] == rel_type 
-                                     for r in relationships):
-                                relationships.append({
-                                    "start": subj_id,
-                                    "end": obj_id,
-                                    "type": rel_type,
-                                    "metadata": {
-                                        "source": para["id"],
-                                        "verb": token.head.text,
-                                        "confidence": "medium"
-                                    }
-                                })
+                                # Check if relationship already exists
+                                rel_key = (subj_id, obj_id, rel_type)
+                                if rel_key not in rel_keys:
+                                    rel_keys.add(rel_key)
+                                    relationships.append({
+                                        "start": subj_id,
+                                        "end": obj_id,
+                                        "type": rel_type,
+                                        "metadata": {
+                                            "source": para["id"],
+                                            "verb": token.head.text,
+                                            "confidence": "medium"
+                                        }
+                                    })
             
             # Also create simple co-occurrence relationships for entities in same paragraph
             # If multiple entities of different types appear together, create relationships
-            person_entities = [eid for eid in para_entities 
-                             if entity_map.get(eid, {}).get("label") == "Person"]
-            company_entities = [eid for eid in para_entities 
-                              if entity_map.get(eid, {}).get("label") == "Company"]
-            location_entities = [eid for eid in para_entities 
-                               if entity_map.get(eid, {}).get("label") == "Location"]
+            # (one pass buckets the paragraph's distinct entities by label, in mention order)
+            entities_by_label = {"Person": {}, "Company": {}, "Location": {}}
+            for eid in para_entities:
+                bucket = entities_by_label.get(entity_map.get(eid, {}).get("label"))
+                if bucket is not None:
+                    bucket[eid] = None
+            person_entities = list(entities_by_label["Person"])
+            company_entities = list(entities_by_label["Company"])
+            location_entities = list(entities_by_label["Location"])
             
             # Person-Company relationships
             for person_id in person_entities:
                 for company_id in company_entities:
                     rel_key = (person_id, company_id, "WORKS_AT")
-                    if not any(r["start"] == person_id and r["end"] == company_id and r["type"] == "WORKS_AT" 
-                             for r in relationships):
+                    if rel_key not in rel_keys:
+                        rel_keys.add(rel_key)
                         relationships.append({
                             "start": person_id,
                             "end": company_id,
@@ -376,8 +487,8 @@ class IngestionPipeline:
             for company_id in company_entities:
                 for location_id in location_entities:
                     rel_key = (company_id, location_id, "LOCATED_IN")
-                    if not any(r["start"] == company_id and r["end"] == location_id and r["type"] == "LOCATED_IN" 
-                             for r in relationships):
+                    if rel_key not in rel_keys:
+                        rel_keys.add(rel_key)
                         relationships.append({
                             "start": company_id,
                             "end": location_id,
@@ -404,42 +515,40 @@ class IngestionPipeline:
         relationships = []
         entity_map = {}
         
-        # Common entity patterns (can be expanded)
-        person_keywords = ["alice", "bob", "john", "mary", "david", "sarah", "engineer", "developer", "manager", "director", "ceo", "cto"]
-        company_keywords = ["company", "corporation", "inc", "ltd", "llc", "organization", "firm", "enterprise"]
-        location_keywords = ["bangalore", "mumbai", "delhi", "new york", "london", "san francisco", "city", "location"]
-        tech_keywords = ["ai", "machine learning", "deep learning", "neural network", "algorithm", "database", "graph", "vector"]
-        
         for para in paragraphs:
             text_lower = para["text"].lower()
             para_entities = []
             
-            # Extract persons (check for person keywords first, then capitalized names)
+            # Clean each word once; both passes below reuse it
             words = para["text"].split()
-            for word in words:
-                word_clean = word.strip(".,!?;:").lower()
+            words_stripped = [word.strip(".,!?;:") for word in words]
+            words_clean = [word.lower() for word in words_stripped]
+            has_company_kw = [_COMPANY_KEYWORD_RE.search(word_clean) is not None for word_clean in words_clean]
+            
+            # Extract persons (check for person keywords first, then capitalized names)
+            for word, word_stripped, word_clean, is_company in zip(words, words_stripped, words_clean, has_company_kw):
                 # Check if it's a known person keyword
-                if word_clean in person_keywords:
+                if word_clean in _PERSON_KEYWORDS:
                     entity_id = f"e_{word_clean}"
                     if entity_id not in entity_map:
                         entity_map[entity_id] = {
                             "id": entity_id,
                             "label": "Person",
-                            "metadata": {"name": word.strip(".,!?;:").capitalize()}
+                            "metadata": {"name": word_stripped.capitalize()}
                         }
                         entities.append(entity_map[entity_id])
                     para_entities.append(entity_id)
                 # Check for capitalized names (but skip if it's a company keyword)
                 elif (word[0].isupper() and len(word) > 3 and 
-                      word_clean not in ["the", "this", "that", "there", "company", "corporation"] and
-                      not any(ck in word_clean for ck in company_keywords)):
+                      word_clean not in _NOT_NAME_WORDS and
+                      not is_company):
                     # Only add if not already added as company
                     entity_id = f"e_{word_clean}"
                     if entity_id not in entity_map:
                         entity_map[entity_id] = {
                             "id": entity_id,
                             "label": "Person",
-                            "metadata": {"name": word.strip(".,!?;:")}
+                            "metadata": {"name": word_stripped}
                         }
                         entities.append(entity_map[entity_id])
                     if entity_id not in para_entities:
@@ -447,14 +556,11 @@ class IngestionPipeline:
             
             # Extract companies/organizations (check for capitalized company names)
             # Look for capitalized words that might be company names
-            words = para["text"].split()
-            for i, word in enumerate(words):
-                word_clean = word.strip(".,!?;:").lower()
+            for i in range(len(words)):
                 # Check if next word is a company keyword
                 if i < len(words) - 1:
-                    next_word = words[i+1].strip(".,!?;:").lower()
-                    if next_word in company_keywords or any(ck in next_word for ck in company_keywords):
-                        company_name = word.strip(".,!?;:")
+                    if has_company_kw[i+1]:
+                        company_name = words_stripped[i]
                         entity_id = f"e_{company_name.lower().replace(' ', '_')}"
                         if entity_id not in entity_map:
                             entity_map[entity_id] = {
@@ -465,9 +571,9 @@ class IngestionPipeline:
                             entities.append(entity_map[entity_id])
                         para_entities.append(entity_id)
                 # Also check if word itself contains company indicators
-                elif any(ck in word_clean for ck in company_keywords):
+                elif has_company_kw[i]:
                     if i > 0:
-                        company_name = words[i-1].strip(".,!?;:")
+                        company_name = words_stripped[i-1]
                         entity_id = f"e_{company_name.lower().replace(' ', '_')}"
                         if entity_id not in entity_map:
                             entity_map[entity_id] = {
@@ -478,9 +584,12 @@ class IngestionPipeline:
                             entities.append(entity_map[entity_id])
                         para_entities.append(entity_id)
             
-            # Extract locations
-            for keyword in location_keywords:
-                if keyword in text_lower:
+            # Extract locations and tech concepts: one scan finds every keyword occurring
+            # in the text, which are then emitted in keyword order
+            found = set(_SCAN_KEYWORD_RE.findall(text_lower))
+            
+            for keyword in _LOCATION_KEYWORDS:
+                if keyword in found:
                     entity_id = f"e_{keyword}"
                     if entity_id not in entity_map:
                         entity_map[entity_id] = {
@@ -491,9 +600,8 @@ class IngestionPipeline:
                         entities.append(entity_map[entity_id])
                     para_entities.append(entity_id)
             
-            # Extract tech concepts
-            for keyword in tech_keywords:
-                if keyword in text_lower:
+            for keyword in _TECH_KEYWORDS:
+                if keyword in found:
                     entity_id = f"e_{keyword.replace(' ', '_')}"
                     if entity_id not in entity_map:
                         entity_map[entity_id] = {
@@ -22,6 +22,10 @@ VECTOR_DB_PATH.mkdir(exist_ok=True)
 VECTOR_DB_TYPE = "chromadb"  # Using ChromaDB as the default vector database
 VECTOR_DB_DIR = "vector_db_store"  # Directory for vector DB storage
 
+# Storage dtype for the local vector DB: "float32", or "float16" to halve its memory,
+# disk footprint and search bandwidth (scores are still computed in float32)
+VECTOR_DTYPE = "float32"
+
 # -------------------- GRAPH DB CONFIG --------------------
 # Memgraph / Graph DB connection settings using gqlalchemy
 GRAPH_DB_HOST = "127.0.0.1"
@@ -33,6 +37,14 @@ GRAPH_DB_PASSWORD = ""  # default for local Windows Memgraph
 # Sentence transformer model for embeddings
 EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 
+# Texts per encoder forward pass. Inputs are length-sorted before batching, so each
+# batch only pads to its own longest text.
+EMBEDDING_BATCH_SIZE = 64
+
+# Run the embedding model as int8-quantized ONNX on CPU (needs optimum[onnxruntime]).
+# Vectors differ slightly from FP32 ones, so re-index existing data after switching.
+EMBEDDING_USE_ONNX_INT8 = False
+
 # Maximum text length per embedding chunk (optional, for chunking)
 MAX_CHUNK_LENGTH = 500  # number of characters
 
@@ -43,5 +55,10 @@ SUPPORTED_FILE_TYPES = {".txt", ".pdf", ".docx", ".csv"}
 # OCR flag (not used currently)
 USE_OCR = False
 
+# -------------------- FRONTEND SETTINGS --------------------
+# Index uploaded documents in a background thread so the UI stays responsive
+# (False: index synchronously behind a spinner)
+PARALLEL_INGEST = True
+
 # -------------------- OTHER SETTINGS --------------------
 # Placeholder for any future constants or feature toggles
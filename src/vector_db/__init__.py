@@ -1,6 +1,6 @@
 from .qdrant_client import LocalVectorDB
 from .chromadb_client import ChromaDBClient
-from src.utils.config import VECTOR_DB_TYPE, VECTOR_DB_DIR
+from src.utils.config import VECTOR_DB_TYPE, VECTOR_DB_DIR, VECTOR_DTYPE
 
 
 def get_vector_db(dim: int = 384, db_dir: str = None):
@@ -20,7 +20,7 @@ def get_vector_db(dim: int = 384, db_dir: str = None):
     if VECTOR_DB_TYPE == "chromadb":
         return ChromaDBClient(dim=dim, db_dir=db_dir)
     else:
-        return LocalVectorDB(dim=dim, db_dir=db_dir)
+        return LocalVectorDB(dim=dim, db_dir=db_dir, dtype=VECTOR_DTYPE)
 
 
 # Export both implementations and factory function
@@ -1,9 +1,14 @@
 import os
 import chromadb
+import numpy as np
 from chromadb.config import Settings
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import uuid
 
+# HNSW index settings for new collections: cosine distance (embeddings are normalized),
+# with more graph links and a wider construction search than Chroma's defaults for better recall
+COLLECTION_METADATA = {"hnsw:space": "cosine", "hnsw:M": 32, "hnsw:construction_ef": 200}
+
 
 class ChromaDBClient:
     """
@@ -39,7 +44,7 @@ class ChromaDBClient:
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"}  # Use cosine similarity
+            metadata=COLLECTION_METADATA
         )
     
     # ----------------------------------------------------------
@@ -57,7 +62,7 @@ class ChromaDBClient:
             # Collection doesn't exist, create it
             self.collection = self.client.get_or_create_collection(
                 name=self.collection_name,
-                metadata={"hnsw:space": "cosine"}
+                metadata=COLLECTION_METADATA
             )
     
     def close(self):
@@ -86,9 +91,9 @@ class ChromaDBClient:
             embeddings: List of embedding vectors
             metadatas: List of metadata dictionaries
         """
-        # ChromaDB expects embeddings as list of lists
-        # Ensure embeddings are the right format
-        embeddings_list = [list(emb) for emb in embeddings]
+        # ChromaDB expects embeddings as list of lists of Python floats
+        # (accepts numpy arrays from the embedder as well as plain lists)
+        embeddings_list = np.asarray(embeddings, dtype=np.float32).tolist()
         
         # ChromaDB requires all metadata values to be strings, numbers, or booleans
         # Convert complex objects to JSON strings
@@ -110,12 +115,16 @@ class ChromaDBClient:
                     processed_meta[key] = str(value)
             processed_metadatas.append(processed_meta)
         
-        # Upsert to ChromaDB
-        self.collection.upsert(
-            ids=ids,
-            embeddings=embeddings_list,
-            metadatas=processed_metadatas
-        )
+        # Upsert to ChromaDB - one call per batch, split only where a document
+        # exceeds the client's maximum batch size
+        max_batch_size = getattr(self.client, "max_batch_size", None) or max(len(ids), 1)
+        for start in range(0, len(ids), max_batch_size):
+            end = start + max_batch_size
+            self.collection.upsert(
+                ids=ids[start:end],
+                embeddings=embeddings_list[start:end],
+                metadatas=processed_metadatas[start:end]
+            )
     
     def search_vector(self, query_vector: List[float], top_k: int = 5):
         """
@@ -133,7 +142,7 @@ class ChromaDBClient:
         
         # Perform similarity search
         results = self.collection.query(
-            query_embeddings=[list(query_vector)],
+            query_embeddings=[np.asarray(query_vector, dtype=np.float32).tolist()],
             n_results=top_k
         )
         
@@ -200,11 +209,12 @@ class ChromaDBClient:
     
     # -------------------- CRUD Compatibility Methods --------------------
     
-    def add_document(self, doc_id: str, content: Dict[str, Any]):
+    def add_document(self, doc_id: str, content: Dict[str, Any], embeddings: Optional[np.ndarray] = None):
         """
         Add a single document with its content.
         This is a convenience method that extracts paragraphs and creates embeddings.
-        Note: This method expects content to already have embeddings in paragraphs.
+        Note: This method expects content to already have embeddings in paragraphs,
+        or an (n_paragraphs, dim) embeddings array whose rows follow the paragraph order.
         For better control, use upsert_documents directly.
         """
         # Extract paragraphs with embeddings
@@ -212,20 +222,24 @@ class ChromaDBClient:
         if not paragraphs:
             return
         
+        if embeddings is not None and len(embeddings) != len(paragraphs):
+            raise ValueError(f"Got {len(embeddings)} embeddings for {len(paragraphs)} paragraphs of {doc_id}.")
+        
         ids = []
-        embeddings = []
+        paragraph_embeddings = []
         metadatas = []
         
-        for para in paragraphs:
+        for i, para in enumerate(paragraphs):
             para_id = f"{doc_id}_{para.get('id', len(ids))}"
             ids.append(para_id)
             
-            # Get embedding from paragraph (should be added by caller)
-            embedding = para.get("embedding")
-            if embedding is None:
-                raise ValueError(f"Paragraph {para_id} missing embedding. Call embedder first.")
-            
-            embeddings.append(embedding)
+            if embeddings is None:
+                # Get embedding from paragraph (should be added by caller)
+                embedding = para.get("embedding")
+                if embedding is None:
+                    raise ValueError(f"Paragraph {para_id} missing embedding. Call embedder first.")
+                
+                paragraph_embeddings.append(embedding)
             
             # Create metadata - include entity_ids from paragraph if available
             entity_ids = para.get("entity_ids", [])
@@ -236,10 +250,15 @@ class ChromaDBClient:
                 "source": content.get("source", doc_id),
                 "type": content.get("type", ""),
                 "metadata": content.get("metadata", {}),
-                "entity_ids": entity_ids  # Store entity IDs for graph retrieval
+                "entity_ids": entity_ids,  # Store entity IDs for graph retrieval
+                # Neighbor paragraphs, so results can show their context without re-parsing the document
+                "prev_text": paragraphs[i - 1].get("text", "") if i > 0 else "",
+                "next_text": paragraphs[i + 1].get("text", "") if i + 1 < len(paragraphs) else ""
             }
             metadatas.append(metadata)
         
+        if embeddings is None:
+            embeddings = paragraph_embeddings
         self.upsert_documents(ids=ids, embeddings=embeddings, metadatas=metadatas)
     
     def get_document(self, doc_id: str) -> Dict[str, Any]:
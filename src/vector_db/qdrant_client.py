@@ -1,13 +1,23 @@
 import os
 import json
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+# Windows cannot replace a file that any process still has memory-mapped, so
+# vectors.npy is only memory-mapped elsewhere; on Windows it is read into memory
+_VECTORS_MMAP_MODE = None if os.name == "nt" else "r"
+
+# Rows per similarity-search tile: each tile is upcast to float32 on its own, so
+# float16 storage never needs a full-size float32 copy of the matrix
+_SEARCH_TILE_ROWS = 65536
 
 
 class LocalVectorDB:
-    def __init__(self, dim: int = 384, db_dir: str = "vector_db_store"):
+    def __init__(self, dim: int = 384, db_dir: str = "vector_db_store", dtype: str = "float32"):
         self.dim = dim
         self.db_dir = db_dir
+        # Storage dtype of the vectors ("float16" halves memory, disk and scan bandwidth)
+        self.dtype = np.dtype(dtype)
 
         self.vec_path = os.path.join(db_dir, "vectors.npy")
         self.meta_path = os.path.join(db_dir, "metadata.json")
@@ -20,10 +30,19 @@ class LocalVectorDB:
     # Internal
     # ----------------------------------------------------------
 
+    def _disk_state(self):
+        """Modification times of the vector and metadata files (None if either is missing)."""
+        try:
+            return (os.stat(self.vec_path).st_mtime_ns, os.stat(self.meta_path).st_mtime_ns)
+        except OSError:
+            return None
+
     def _load(self):
         """Load vectors + metadata if available."""
         if os.path.exists(self.vec_path) and os.path.exists(self.meta_path):
-            self.vectors = np.load(self.vec_path)
+            # Memory-mapped read-only: the OS page cache keeps the vectors resident,
+            # and inserts/deletes copy them into memory before changing anything
+            self.vectors = np.load(self.vec_path, mmap_mode=_VECTORS_MMAP_MODE)
             with open(self.meta_path, "r") as f:
                 meta = json.load(f)
                 self.ids = meta["ids"]
@@ -32,31 +51,61 @@ class LocalVectorDB:
             self.vectors = np.zeros((0, self.dim), dtype=np.float32)
             self.ids = []
             self.payloads = {}
+        self._buffer = self.vectors
+        self._loaded_state = self._disk_state()
     
     def reload(self):
         """
         Reload vectors and metadata from disk.
-        Useful when the database is updated by another process or instance.
+        Useful when the database is updated by another process or instance;
+        a no-op when the files have not changed since this instance last read or wrote them.
         """
-        self._load()
+        if self._disk_state() != self._loaded_state:
+            self._load()
 
     def _save(self):
-        np.save(self.vec_path, self.vectors)
+        # Write to a temporary file and swap it in: truncating vectors.npy in place
+        # would pull the pages out from under memory maps of the old file (instances
+        # still mapping it keep reading the old data until they reload). On Windows
+        # the file is never mapped, since os.replace fails over a mapped file there.
+        tmp_path = self.vec_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, self.vectors)
+        os.replace(tmp_path, self.vec_path)
         with open(self.meta_path, "w") as f:
             json.dump({
                 "ids": self.ids,
                 "payloads": self.payloads
             }, f)
+        self._loaded_state = self._disk_state()
+
+    def _append_vectors(self, new_vectors: np.ndarray):
+        """
+        Append rows to self.vectors. The backing buffer grows geometrically, so
+        repeated inserts do not copy the whole matrix every time.
+        """
+        if len(new_vectors) == 0:
+            return
+        count = len(self.vectors)
+        needed = count + len(new_vectors)
+        # A freshly loaded buffer is the read-only memory map of vectors.npy
+        if (needed > len(self._buffer) or self._buffer.dtype != self.dtype
+                or not self._buffer.flags.writeable):
+            buffer = np.empty((max(needed, 2 * len(self._buffer), 1024), self.vectors.shape[1]), dtype=self.dtype)
+            buffer[:count] = self.vectors
+            self._buffer = buffer
+        self._buffer[count:needed] = new_vectors
+        self.vectors = self._buffer[:needed]
 
     # ----------------------------------------------------------
     # Public API
     # ----------------------------------------------------------
 
     def upsert_documents(self, ids: List[str], embeddings: List[List[float]], metadatas: List[Dict[str, Any]]):
-        new_vectors = np.array(embeddings, dtype=np.float32)
+        new_vectors = np.asarray(embeddings, dtype=self.dtype)
 
         # Append to existing database
-        self.vectors = np.vstack([self.vectors, new_vectors])
+        self._append_vectors(new_vectors)
 
         for i, doc_id in enumerate(ids):
             self.ids.append(doc_id)
@@ -68,12 +117,15 @@ class LocalVectorDB:
         if len(self.vectors) == 0:
             return []
 
-        q = np.array(query_vector, dtype=np.float32).reshape(1, -1)
+        q = np.array(query_vector, dtype=np.float32).reshape(-1)
+        q_norm = np.linalg.norm(q)
 
-        # Cosine similarity = 1 - cosine distance
-        dot_products = np.dot(self.vectors, q.T).reshape(-1)
-        norms = (np.linalg.norm(self.vectors, axis=1) * np.linalg.norm(q))
-        similarities = dot_products / norms
+        # Cosine similarity = 1 - cosine distance, computed in float32 tile by tile
+        similarities = np.empty(len(self.vectors), dtype=np.float32)
+        for start in range(0, len(self.vectors), _SEARCH_TILE_ROWS):
+            tile = self.vectors[start:start + _SEARCH_TILE_ROWS].astype(np.float32, copy=False)
+            norms = np.linalg.norm(tile, axis=1) * q_norm
+            similarities[start:start + len(tile)] = (tile @ q) / norms
 
         # Sort top-k
         top_indices = np.argsort(similarities)[::-1][:top_k]
@@ -94,25 +146,26 @@ class LocalVectorDB:
             if doc_id not in ids
         ]
 
-        self.vectors = self.vectors[indices_to_keep]
+        self.vectors = self._buffer = self.vectors[indices_to_keep]
         self.ids = [self.ids[i] for i in indices_to_keep]
         self.payloads = {doc_id: self.payloads[doc_id] for doc_id in self.ids}
 
         self._save()
 
     def delete_all(self):
-        self.vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self.vectors = self._buffer = np.zeros((0, self.dim), dtype=np.float32)
         self.ids = []
         self.payloads = {}
         self._save()
 
     # -------------------- CRUD Compatibility Methods --------------------
     
-    def add_document(self, doc_id: str, content: Dict[str, Any]):
+    def add_document(self, doc_id: str, content: Dict[str, Any], embeddings: Optional[np.ndarray] = None):
         """
         Add a single document with its content.
         This is a convenience method that extracts paragraphs and creates embeddings.
-        Note: This method expects content to already have embeddings in paragraphs.
+        Note: This method expects content to already have embeddings in paragraphs,
+        or an (n_paragraphs, dim) embeddings array whose rows follow the paragraph order.
         For better control, use upsert_documents directly.
         """
         # Extract paragraphs with embeddings
@@ -120,20 +173,24 @@ class LocalVectorDB:
         if not paragraphs:
             return
         
+        if embeddings is not None and len(embeddings) != len(paragraphs):
+            raise ValueError(f"Got {len(embeddings)} embeddings for {len(paragraphs)} paragraphs of {doc_id}.")
+        
         ids = []
-        embeddings = []
+        paragraph_embeddings = []
         metadatas = []
         
-        for para in paragraphs:
+        for i, para in enumerate(paragraphs):
             para_id = f"{doc_id}_{para.get('id', len(ids))}"
             ids.append(para_id)
             
-            # Get embedding from paragraph (should be added by caller)
-            embedding = para.get("embedding")
-            if embedding is None:
-                raise ValueError(f"Paragraph {para_id} missing embedding. Call embedder first.")
-            
-            embeddings.append(embedding)
+            if embeddings is None:
+                # Get embedding from paragraph (should be added by caller)
+                embedding = para.get("embedding")
+                if embedding is None:
+                    raise ValueError(f"Paragraph {para_id} missing embedding. Call embedder first.")
+                
+                paragraph_embeddings.append(embedding)
             
             # Create metadata - include entity_ids from paragraph if available
             entity_ids = para.get("entity_ids", [])
@@ -144,10 +201,15 @@ class LocalVectorDB:
                 "source": content.get("source", doc_id),
                 "type": content.get("type", ""),
                 "metadata": content.get("metadata", {}),
-                "entity_ids": entity_ids  # Store entity IDs for graph retrieval
+                "entity_ids": entity_ids,  # Store entity IDs for graph retrieval
+                # Neighbor paragraphs, so results can show their context without re-parsing the document
+                "prev_text": paragraphs[i - 1].get("text", "") if i > 0 else "",
+                "next_text": paragraphs[i + 1].get("text", "") if i + 1 < len(paragraphs) else ""
             }
             metadatas.append(metadata)
         
+        if embeddings is None:
+            embeddings = paragraph_embeddings
         self.upsert_documents(ids=ids, embeddings=embeddings, metadatas=metadatas)
 
     def get_document(self, doc_id: str) -> Dict[str, Any]:
@@ -328,6 +328,170 @@ def test_plain_text_save():
         return False
 
 
+def test_batch_html_files():
+    """Test processing several HTML files in parallel."""
+    print("=" * 70)
+    print("TESTING BATCH HTML FILE PROCESSING")
+    print("=" * 70)
+    
+    import tempfile
+    
+    processor = UnstructuredDataProcessor()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        html_paths = []
+        for i in range(3):
+            html_path = Path(tmp_dir) / f"batch_{i}.html"
+            html_path.write_text(
+                f"<html><body><h1>Batch Document {i}</h1>"
+                f"<p>This is the content of batch document number {i}.</p></body></html>",
+                encoding="utf-8"
+            )
+            html_paths.append(html_path)
+        
+        results = processor.process_html_files(html_paths, max_workers=2)
+        
+        assert len(results) == len(html_paths), f"Expected {len(html_paths)} results, got {len(results)}"
+        
+        for i, result in enumerate(results):
+            assert result["success"], f"{html_paths[i].name} failed: {result.get('error', 'Unknown error')}"
+            assert result["filename"] == f"batch_{i}.txt", f"Result {i} is for {result['filename']}"
+            saved_content = Path(result["file_path"]).read_text(encoding="utf-8")
+            assert f"Batch Document {i}" in saved_content, f"{result['filename']} does not match its input"
+            assert f"batch document number {i}." in saved_content, f"{result['filename']} is missing its paragraph"
+            assert "<h1>" not in saved_content and "<p>" not in saved_content, f"{result['filename']} still contains HTML tags"
+            print(f"✅ {result['filename']}: {result['content_length']} characters")
+
+
+def test_batch_save():
+    """Test processing and saving several inputs in one call."""
+    print("=" * 70)
+    print("TESTING BATCH PROCESS AND SAVE")
+    print("=" * 70)
+    
+    import tempfile
+    
+    processor = UnstructuredDataProcessor()
+    
+    items = [
+        ("<html><body><h1>Batch Page</h1><p>Saved together with the other inputs.</p></body></html>", "html", "batch_page"),
+        ("# Batch Notes\n\nMarkdown saved in the same batch.", "markdown", "batch_notes"),
+        ("", "html", "batch_empty"),
+    ]
+    expected_text = ["Saved together with the other inputs.", "Markdown saved in the same batch."]
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = processor.process_and_save_many(items, Path(tmp_dir))
+        
+        assert len(results) == len(items), f"Expected {len(items)} results, got {len(results)}"
+        
+        # Results come back in input order
+        for (content, content_type, filename), result, text in zip(items[:2], results[:2], expected_text):
+            assert result["success"], f"{filename} failed: {result.get('error', 'Unknown error')}"
+            assert result["filename"] == f"{filename}.txt", f"Expected {filename}.txt, got {result['filename']}"
+            saved_path = Path(result["file_path"])
+            assert saved_path.exists(), f"{filename} was not saved"
+            saved_content = saved_path.read_text(encoding="utf-8")
+            assert text in saved_content, f"{result['filename']} does not contain its input text"
+            assert result["content_length"] > 0, f"{filename} reported no content"
+            print(f"✅ {result['filename']}: {result['content_length']} characters")
+        
+        error_result = results[2]
+        assert not error_result["success"], "Empty HTML input should fail"
+        assert error_result["error"], "Failed result should carry an error message"
+        assert error_result["file_path"] is None and error_result["filename"] is None, "Failed result should not name a file"
+        assert error_result["content_length"] == 0 and error_result["paragraphs"] == 0, "Failed result should report no content"
+        assert not (Path(tmp_dir) / "batch_empty.txt").exists(), "Empty input should not be written"
+        print(f"✅ Empty input rejected: {error_result['error']}")
+
+
+def test_shared_prefix_lines_kept():
+    """Test that lines sharing a long lead-in are not dropped as duplicates."""
+    print("=" * 70)
+    print("TESTING DUPLICATE DETECTION WITH SHARED PREFIXES")
+    print("=" * 70)
+    
+    processor = UnstructuredDataProcessor()
+    
+    production = "Step 1: Configure the server settings by editing config.yaml for the production cluster."
+    staging = "Step 1: Configure the server settings by editing hosts.ini for the staging cluster instead."
+    text = "\n".join([production, staging, production, "step 1: configure the server settings by editing config.yaml, for the production cluster"])
+    
+    cleaned = processor._clean_and_format_text(text)
+    lines = cleaned.split("\n")
+    
+    assert lines == [production, staging], f"Unexpected lines: {lines}"
+    print("✅ Lines with a shared prefix kept; exact and punctuation-only duplicates dropped")
+
+
+def test_main_region_extraction():
+    """Test that divs inside <main> / role="main" are kept and div chrome outside it is dropped."""
+    print("=" * 70)
+    print("TESTING MAIN REGION EXTRACTION")
+    print("=" * 70)
+    
+    processor = UnstructuredDataProcessor()
+    
+    promo = "Sign up today for our weekly newsletter and special offers"
+    content = "Revenue grew by twelve percent across all regions this quarter."
+    legal = "Cookie settings and legal notices for this website apply"
+    html_template = (
+        "<html><body>"
+        f"<div class=\"promo\">{promo}</div>"
+        "{open}<h1>Quarterly Report</h1>"
+        f"<div class=\"card\">{content}</div>{{close}}"
+        f"<div class=\"banner\">{legal}</div>"
+        "</body></html>"
+    )
+    
+    for open_tag, close_tag in (("<main>", "</main>"), ("<div role=\"main\">", "</div>")):
+        result = processor.process_html(html_template.format(open=open_tag, close=close_tag))
+        assert "# Quarterly Report" in result, f"Heading missing with {open_tag}: {result!r}"
+        assert content in result, f"Main content missing with {open_tag}: {result!r}"
+        assert promo not in result and legal not in result, f"Chrome outside {open_tag} kept: {result!r}"
+        print(f"✅ {open_tag}: main content kept, outside divs dropped")
+    
+    # Without a main region every content div is still considered
+    result = processor.process_html(html_template.format(open="", close=""))
+    assert promo in result and content in result and legal in result, f"Divs missing without <main>: {result!r}"
+    print("✅ No main region: all content divs kept")
+
+
+def test_markdown_token_walk_matches_dom():
+    """Test that the markdown-it token walk gives the same parts as walking the rendered HTML."""
+    print("=" * 70)
+    print("TESTING MARKDOWN TOKEN WALK AGAINST THE HTML PATH")
+    print("=" * 70)
+    
+    from src.data_processor.unstructured_processor import MARKDOWN_IT_AVAILABLE, _MARKDOWN_IT
+    if not MARKDOWN_IT_AVAILABLE:
+        print("⚠️  markdown-it-py not installed, skipping")
+        return
+    
+    processor = UnstructuredDataProcessor()
+    
+    samples = {
+        "headings": "# Project Guide\n\n## Setup *steps*\n\n### Notes",
+        "lists": (
+            "1. Install the package with pip\n2. Run the `init` command\n"
+            "   - nested item one\n   - nested item two\n\n"
+            "- Loose item with a paragraph\n\n- Another loose item here"
+        ),
+        "code fences": "Intro paragraph before the code.\n\n```python\ndef main():\n    return 42\n```\n\n    indented code block",
+        "links": (
+            "Read the [setup docs](https://example.com/docs \"Docs\") first.\n\n"
+            "See <https://example.org> or ![diagram](arch.png) for **more** details."
+        ),
+    }
+    samples["all together"] = "\n\n".join(samples.values())
+    
+    for name, markdown_content in samples.items():
+        token_parts = processor._markdown_text_parts(markdown_content)
+        dom_parts = processor._markdown_dom_text_parts(_MARKDOWN_IT.render(markdown_content))
+        assert token_parts == dom_parts, f"{name}: token walk {token_parts!r} != HTML path {dom_parts!r}"
+        print(f"✅ {name}: {len(token_parts)} parts match")
+
+
 def test_url_scraping():
     """Test URL scraping (optional - may fail if no internet or URL issues)."""
     print("=" * 70)
@@ -359,6 +523,18 @@ def test_url_scraping():
         return True  # Not a failure, just network issue
 
 
+def run_assert_test(test):
+    """Run an assert-based test for main(), returning whether it passed."""
+    try:
+        test()
+        return True
+    except Exception as e:
+        print(f"❌ {test.__name__} failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main():
     """Run all tests."""
     print("\n" + "=" * 70)
@@ -380,6 +556,16 @@ def main():
     print()
     results.append(("Plain Text Save", test_plain_text_save()))
     print()
+    results.append(("Batch HTML Files", run_assert_test(test_batch_html_files)))
+    print()
+    results.append(("Batch Save", run_assert_test(test_batch_save)))
+    print()
+    results.append(("Shared Prefix Lines", run_assert_test(test_shared_prefix_lines_kept)))
+    print()
+    results.append(("Main Region Extraction", run_assert_test(test_main_region_extraction)))
+    print()
+    results.append(("Markdown Token Walk", run_assert_test(test_markdown_token_walk_matches_dom)))
+    print()
     results.append(("URL Scraping", test_url_scraping()))
     print()
     